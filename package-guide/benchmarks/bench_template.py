@@ -0,0 +1,84 @@
+"""
+Compares building FletPackageGuide controls with the plain constructor and
+with `FletPackageGuide.template()`.
+
+Run from the package-guide directory, after installing the package with
+`pip install -e .`:
+
+    python benchmarks/bench_template.py
+
+or without installing it:
+
+    PYTHONPATH=src python benchmarks/bench_template.py
+"""
+
+import time
+
+import flet as ft
+
+from flet_package_guide import FletPackageGuide
+
+COLORS = [ft.Colors.RED, ft.Colors.BLUE, ft.Colors.PRIMARY]
+COMPLEX_DATA = {
+    "hello": "world",
+    "foo": "bar",
+    "arrs": {
+        "int": 1,
+        "bool": True,
+        "double": 1.123,
+        "list": ["a", 2, True, [[2], 1]],
+        "size": {"width": 300, "height": 300},
+    },
+}
+
+
+def on_something(e):
+    pass
+
+
+def build_plain(n):
+    return [
+        FletPackageGuide(
+            colors=COLORS,
+            complex_data=COMPLEX_DATA,
+            on_something=on_something,
+            content=ft.Text(str(i)),
+        )
+        for i in range(n)
+    ]
+
+
+def build_template(n):
+    tile = FletPackageGuide.template(
+        colors=COLORS, complex_data=COMPLEX_DATA, on_something=on_something
+    )
+    return [tile(content=ft.Text(str(i))) for i in range(n)]
+
+
+def serialize(controls):
+    for c in controls:
+        c._build_add_commands()
+
+
+def bench(label, build, n, repeat=5):
+    best_build = best_total = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        controls = build(n)
+        t1 = time.perf_counter()
+        serialize(controls)
+        t2 = time.perf_counter()
+        best_build = min(best_build, t1 - t0)
+        best_total = min(best_total, t2 - t0)
+    print(
+        f"{label:<10} n={n:<6} construct {best_build * 1000:8.1f} ms"
+        f"   construct+serialize {best_total * 1000:8.1f} ms"
+    )
+    return best_build
+
+
+if __name__ == "__main__":
+    for n in (1_000, 10_000):
+        plain = bench("plain", build_plain, n)
+        templ = bench("template", build_template, n)
+        print(f"{'':<10} speedup (construct) {plain / templ:.2f}x\n")
@@ -0,0 +1,288 @@
+"""
+Load and soak test for FletPackageGuide against a simulated Flutter client.
+
+Spins up `--processes` worker processes, each running `--sessions` simulated
+sessions (`flet_package_guide.testing.SimulatedClient`) with `--controls`
+controls. One driver thread per session keeps calling `play`,
+`call_dart_with_timeout`, `async_operation_with_callback` and
+`start_task_with_progress_updates` at random. `--latency-tracking` turns on
+latency tracking, and `--completion-only` subscribes every control to the
+`complete`/`error` task statuses only, so both paths are soaked as well.
+
+Every `--sample-interval` seconds the workers report throughput, latencies,
+RSS, live object count and the number of pending callbacks/handlers. After the
+run the samples past the warm-up are checked for steady growth; the script
+exits with status 1 if memory, objects or handler counts keep climbing.
+
+Run from the package-guide directory, after installing the package with
+`pip install -e .`:
+
+    python benchmarks/soak.py --processes 4 --sessions 20 --controls 3 --duration 600
+
+or without installing it, with `PYTHONPATH=src` set.
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing as mp
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+
+from flet_package_guide import FletPackageGuide
+from flet_package_guide.testing import SimulatedClient
+
+OPS = ("play", "timeout", "async", "progress")
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+
+        # ru_maxrss is the peak, not the current RSS; KB on Linux, bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = 0
+
+    def add(self, op, seconds):
+        with self.lock:
+            self.latencies[op].append(seconds * 1000.0)
+
+    def error(self):
+        with self.lock:
+            self.errors += 1
+
+    def drain(self):
+        with self.lock:
+            latencies, self.latencies = dict(self.latencies), defaultdict(list)
+            errors, self.errors = self.errors, 0
+        return latencies, errors
+
+
+def drive(controls, recorder, stop, args, seed):
+    rng = random.Random(seed)
+    while not stop.is_set():
+        control = rng.choice(controls)
+        op = rng.choice(OPS)
+        t0 = time.perf_counter()
+        try:
+            if op == "play":
+                control.play(" soak")
+                recorder.add(op, time.perf_counter() - t0)
+            elif op == "timeout":
+                result = control.call_dart_with_timeout(
+                    "soak", python_timeout_sec=5.0, dart_task_duration_ms=rng.randint(10, 500)
+                )
+                if result.startswith(("Timeout", "Error")):
+                    recorder.error()
+                else:
+                    recorder.add(op, time.perf_counter() - t0)
+            elif op == "async":
+                control.async_operation_with_callback(
+                    "soak", lambda data, t0=t0: recorder.add("async", time.perf_counter() - t0)
+                )
+            else:
+                control.start_task_with_progress_updates(
+                    total_steps=rng.randint(1, 5),
+                    progress_handler=lambda data: None,
+                    completion_handler=lambda data, t0=t0: recorder.add(
+                        "progress", time.perf_counter() - t0
+                    ),
+                )
+        except Exception:
+            recorder.error()
+        time.sleep(args.think_time)
+
+
+def pending_handlers(controls):
+    return sum(
+        len(c._async_callbacks)
+        + len(c._progress_handlers)
+        + len(c._completion_handlers)
+        + len(c._task_groups)
+        + len(c._task_progress)
+        + (len(c.latency_tracker._pending) if c.latency_tracker is not None else 0)
+        for c in controls
+    )
+
+
+def make_control(args):
+    control = FletPackageGuide(on_something=lambda e: None)
+    if args.latency_tracking:
+        control.enable_latency_tracking()
+    if args.completion_only:
+        control.set_event_subscription("task_update", statuses=[])
+    return control
+
+
+def run_worker(worker_id, args, queue):
+    clients = [SimulatedClient(time_scale=args.time_scale) for _ in range(args.sessions)]
+    sessions = [
+        [client.attach(make_control(args)) for _ in range(args.controls)]
+        for client in clients
+    ]
+    recorder = Recorder()
+    stop = threading.Event()
+    drivers = [
+        threading.Thread(
+            target=drive, args=(controls, recorder, stop, args, worker_id * 1000 + i), daemon=True
+        )
+        for i, controls in enumerate(sessions)
+    ]
+    for d in drivers:
+        d.start()
+
+    all_controls = [c for controls in sessions for c in controls]
+    start = time.monotonic()
+    index = 0
+    while time.monotonic() - start < args.duration:
+        time.sleep(args.sample_interval)
+        latencies, errors = recorder.drain()
+        gc.collect()
+        queue.put(
+            {
+                "worker": worker_id,
+                "index": index,
+                "latencies": latencies,
+                "errors": errors,
+                "rss_mb": rss_mb(),
+                "objects": len(gc.get_objects()),
+                "handlers": pending_handlers(all_controls),
+                "timers": sum(c.pending_timers for c in clients),
+            }
+        )
+        index += 1
+
+    stop.set()
+    for d in drivers:
+        d.join()
+    for client in clients:
+        client.close()
+    queue.put({"worker": worker_id, "done": True})
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))]
+
+
+def climbing(series, min_growth, rel_growth):
+    """
+    True if the series keeps growing: the means of its three thirds are strictly
+    increasing and the last third exceeds the first by both thresholds.
+    """
+    if len(series) < 6:
+        return False
+    n = len(series) // 3
+    thirds = [series[:n], series[n : 2 * n], series[2 * n :]]
+    means = [sum(t) / len(t) for t in thirds]
+    growth = means[2] - means[0]
+    return (
+        means[0] < means[1] < means[2]
+        and growth > min_growth
+        and growth > rel_growth * max(means[0], 1e-9)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--sessions", type=int, default=10, help="sessions per process")
+    parser.add_argument("--controls", type=int, default=3, help="controls per session")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds")
+    parser.add_argument("--sample-interval", type=float, default=2.0, help="seconds")
+    parser.add_argument("--think-time", type=float, default=0.01, help="seconds between ops per session")
+    parser.add_argument("--time-scale", type=float, default=0.01, help="factor applied to simulated Dart delays")
+    parser.add_argument("--warmup", type=float, default=0.25, help="fraction of samples ignored by leak checks")
+    parser.add_argument("--rss-tolerance-mb", type=float, default=5.0)
+    parser.add_argument("--growth-tolerance", type=float, default=0.05, help="relative growth allowed")
+    parser.add_argument("--latency-tracking", action="store_true", help="enable latency tracking on every control")
+    parser.add_argument("--completion-only", action="store_true", help="subscribe to complete/error task statuses only")
+    parser.add_argument("--json", help="write the samples and summary to this file")
+    args = parser.parse_args()
+
+    queue = mp.Queue()
+    workers = [mp.Process(target=run_worker, args=(i, args, queue)) for i in range(args.processes)]
+    for w in workers:
+        w.start()
+
+    by_index = defaultdict(list)
+    done = 0
+    print(f"{'t(s)':>6} {'ops/s':>9} {'p50ms':>8} {'p99ms':>8} {'err':>5} {'rss MB':>8} {'objects':>9} {'handlers':>9} {'timers':>7}")
+    while done < len(workers):
+        msg = queue.get()
+        if msg.get("done"):
+            done += 1
+            continue
+        batch = by_index[msg["index"]]
+        batch.append(msg)
+        if len(batch) == len(workers):
+            latencies = [v for m in batch for vs in m["latencies"].values() for v in vs]
+            print(
+                f"{(msg['index'] + 1) * args.sample_interval:6.0f}"
+                f" {len(latencies) / args.sample_interval:9.1f}"
+                f" {percentile(latencies, 50):8.2f} {percentile(latencies, 99):8.2f}"
+                f" {sum(m['errors'] for m in batch):5d}"
+                f" {sum(m['rss_mb'] for m in batch):8.1f}"
+                f" {sum(m['objects'] for m in batch):9d}"
+                f" {sum(m['handlers'] for m in batch):9d}"
+                f" {sum(m['timers'] for m in batch):7d}"
+            )
+    for w in workers:
+        w.join()
+
+    samples = [by_index[i] for i in sorted(by_index) if len(by_index[i]) == len(workers)]
+    per_op = defaultdict(list)
+    for batch in samples:
+        for m in batch:
+            for op, vs in m["latencies"].items():
+                per_op[op].extend(vs)
+    total_ops = sum(len(vs) for vs in per_op.values())
+    wall = len(samples) * args.sample_interval
+
+    steady = samples[int(len(samples) * args.warmup) :]
+    series = {
+        key: [sum(m[key] for m in batch) for batch in steady]
+        for key in ("rss_mb", "objects", "handlers")
+    }
+    leaks = {
+        "rss_mb": climbing(series["rss_mb"], args.rss_tolerance_mb, args.growth_tolerance),
+        "objects": climbing(series["objects"], 1000, args.growth_tolerance),
+        "handlers": climbing(series["handlers"], 10, args.growth_tolerance),
+    }
+    summary = {
+        "throughput_ops": total_ops / wall if wall else 0.0,
+        "errors": sum(m["errors"] for batch in samples for m in batch),
+        "ops": {
+            op: {"count": len(vs), "p50_ms": percentile(vs, 50), "p99_ms": percentile(vs, 99)}
+            for op, vs in sorted(per_op.items())
+        },
+        "leaks": leaks,
+    }
+    print(json.dumps(summary, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "samples": samples, "summary": summary}, f)
+
+    if any(leaks.values()):
+        print("FAIL: " + ", ".join(k for k, v in leaks.items() if v) + " kept climbing.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
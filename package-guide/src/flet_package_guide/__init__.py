@@ -1 +1,11 @@
-from flet_package_guide.flet_package_guide import FletPackageGuide
\ No newline at end of file
+from flet_package_guide.flet_package_guide import (
+    FletPackageGuide,
+    FletPackageGuideTemplate,
+)
+from flet_package_guide.tracing import TraceRecorder, TraceReplayer, read_trace
+from flet_package_guide.timing import LatencyHistogram, LatencyTracker
+from flet_package_guide.task_group import TaskGroup
+from flet_package_guide.palette import Palette, intern_palette, normalize_color
+from flet_package_guide.serialization import AttrWriteQueue
+from flet_package_guide.outbound import OutboundBuffer, OutboundBufferFullError
+from flet_package_guide.profiling import HandlerProfiler
@@ -1,9 +1,10 @@
 # from enum import Enum
-from typing import Any, Optional, List
+from typing import Any, Dict, Iterable, Optional, List, Sequence, Tuple
 
 from flet.core.constrained_control import ConstrainedControl
 from flet.core.control import OptionalNumber
 from flet.core.control import Control
+import copy
 import json
 
 from flet.core.types import (
@@ -12,7 +13,47 @@ from flet.core.types import (
     WebRenderer,
 )
 import uuid
+import time
+import asyncio
 import concurrent.futures
+from functools import partial
+
+from flet_package_guide.outbound import DEFAULT_IDEMPOTENT_METHODS, OutboundBuffer
+from flet_package_guide.palette import intern_palette
+from flet_package_guide.profiling import SAMPLE, HandlerProfiler, ProfileKey
+from flet_package_guide.serialization import (
+    AttrWriteQueue,
+    serialize_colors,
+    serialize_complex_data,
+)
+from flet_package_guide.task_group import TaskGroup, TaskGroupCallable
+from flet_package_guide.timing import LatencyHistogram, LatencyTracker
+from flet_package_guide.tracing import TraceRecorder
+
+# task_update statuses that end a task. They are always sent, whatever the
+# subscriptions, because they release the handlers kept for the task.
+_TERMINAL_STATUSES = ("complete", "error")
+# Python-side values of Control properties that are serialized in
+# before_update(); copied, not shared, by FletPackageGuide._clone().
+_CLONED_FIELDS = (
+    "tooltip",
+    "badge",
+    "_Control__data",
+    "_Control__expand",
+    "_Control__col",
+    "_ConstrainedControl__scale",
+    "_ConstrainedControl__rotate",
+    "_ConstrainedControl__offset",
+    "_ConstrainedControl__animate_opacity",
+    "_ConstrainedControl__animate_size",
+    "_ConstrainedControl__animate_position",
+    "_ConstrainedControl__animate_rotation",
+    "_ConstrainedControl__animate_scale",
+    "_ConstrainedControl__animate_offset",
+)
+# Payload fields an event always carries, whatever its subscribed fields.
+_REQUIRED_FIELDS = {"task_update": ("current_step", "total_steps")}
+
 
 class FletPackageGuide(ConstrainedControl):
     """
@@ -53,6 +94,8 @@ class FletPackageGuide(ConstrainedControl):
         on_something: OptionalControlEventCallable = None,
         complex_data: Optional[Any] = None,
     ):
+        # Must exist before ConstrainedControl.__init__, which registers handlers.
+        self._init_state()
         ConstrainedControl.__init__(
             self,
             tooltip=tooltip,
@@ -69,11 +112,24 @@ class FletPackageGuide(ConstrainedControl):
         self.content = content
         self.on_something = on_something
         self.complex_data = complex_data
+        self._add_event_handler("async_callback", self._on_async_callback)
+        self._add_event_handler("task_update", self._on_task_update)
+
+    def _init_state(self):
+        # Runtime state of a control; never shared between clones.
+        self._raw_event_handlers = {}
+        self._event_subscriptions: Dict[str, Dict[str, List[str]]] = {}
+        self._trace_recorder: Optional[TraceRecorder] = None
+        self._latency_tracker: Optional[LatencyTracker] = None
+        self._attr_writes: Optional[AttrWriteQueue] = None
+        self._outbound_buffer: Optional[OutboundBuffer] = None
+        self._profiler: Optional[HandlerProfiler] = None
+        self.__content: Optional[Control] = None
         self._async_callbacks = {}
         self._progress_handlers = {}
         self._completion_handlers = {} # Corrected initialization
-        self._add_event_handler("async_callback", self._on_async_callback)
-        self._add_event_handler("task_update", self._on_task_update)
+        self._task_groups: Dict[str, TaskGroup] = {}
+        self._task_progress: Dict[str, List[int]] = {}  # task_id -> [total_steps, last_step]
 
     # controls name reference
     # OK
@@ -82,6 +138,437 @@ class FletPackageGuide(ConstrainedControl):
 
     # ENDOK
 
+    # templates
+    @classmethod
+    def template(cls, **props) -> "FletPackageGuideTemplate":
+        """
+        Builds a template for creating many controls with the same properties.
+
+        The properties are set (and `colors`/`complex_data` serialized) once, on a
+        prototype. Calling the template clones the prototype and applies only
+        the per-instance overrides:
+
+            tile = FletPackageGuide.template(colors=[...], complex_data={...})
+            controls = [tile(content=ft.Text(str(i))) for i in range(1000)]
+
+        :param props: Any `FletPackageGuide` constructor argument except `content`.
+        """
+        return FletPackageGuideTemplate(cls, props)
+
+    def _clone(self) -> "FletPackageGuide":
+        # Only the properties set on the template are copied; runtime state
+        # (handlers, task tracking, buffers) and mount state start fresh.
+        clone = self.__class__.__new__(self.__class__)
+        clone._init_state()
+        clone._Control__page = None
+        clone._Control__uid = None
+        clone.parent = None
+        clone._Control__previous_children = []
+        clone._Control__event_handlers = {}
+        # Attribute values are immutable (serialized) so a shallow copy is enough.
+        clone._Control__attrs = dict(self._Control__attrs)
+        for name in _CLONED_FIELDS:
+            value = self.__dict__.get(name)
+            clone.__dict__[name] = None if value is None else copy.deepcopy(value)
+        clone._event_subscriptions = copy.deepcopy(self._event_subscriptions)
+        for event_name, handler in self._raw_event_handlers.items():
+            if getattr(handler, "__self__", None) is self:
+                # Rebind the control's own handlers (e.g. _on_task_update) to the clone.
+                handler = handler.__func__.__get__(clone)
+            # The subscriptions attribute was copied with the other attributes.
+            clone._register_event_handler(event_name, handler)
+        return clone
+
+    # event dispatch
+    # Every handler is registered with Flet through a dispatcher so that inbound
+    # events can be observed (tracing) before they reach the handler.
+    def _add_event_handler(self, event_name: str, handler: OptionalControlEventCallable):
+        self._register_event_handler(event_name, handler)
+        self._update_subscriptions()
+
+    def _register_event_handler(self, event_name: str, handler: OptionalControlEventCallable):
+        self._raw_event_handlers[event_name] = handler
+        if handler is None:
+            dispatcher = None
+        elif asyncio.iscoroutinefunction(handler):
+            dispatcher = partial(self._dispatch_event_async, event_name)
+        else:
+            dispatcher = partial(self._dispatch_event, event_name)
+        super()._add_event_handler(event_name, dispatcher)
+
+    def _get_event_handler(self, event_name: str) -> OptionalControlEventCallable:
+        return self._raw_event_handlers.get(event_name)
+
+    def _dispatch_event(self, event_name: str, e):
+        handler = self._raw_event_handlers.get(event_name)
+        if handler is None:
+            return
+        if self._trace_recorder is not None:
+            self._trace_recorder.record_event(event_name, e.data)
+        if self._profiler is not None:
+            self._profiler.run(self._profile_key(event_name, e), handler, e)
+            return
+        handler(e)
+
+    async def _dispatch_event_async(self, event_name: str, e):
+        handler = self._raw_event_handlers.get(event_name)
+        if handler is None:
+            return
+        if self._trace_recorder is not None:
+            self._trace_recorder.record_event(event_name, e.data)
+        if self._profiler is not None:
+            await self._profiler.run_async(self._profile_key(event_name, e), handler, e)
+            return
+        await handler(e)
+
+    # subscriptions
+    # Dart only builds and sends the events, statuses and fields listed in the
+    # "subscriptions" attribute. It is rebuilt whenever a handler is attached or
+    # removed; call update() for a change to reach a mounted control.
+    def _update_subscriptions(self):
+        manifest = {
+            "events": sorted(
+                name for name, h in self._raw_event_handlers.items() if h is not None
+            )
+        }
+        fields = {
+            name: sub["fields"]
+            for name, sub in self._event_subscriptions.items()
+            if sub.get("fields") is not None
+        }
+        statuses = {
+            name: sub["statuses"]
+            for name, sub in self._event_subscriptions.items()
+            if sub.get("statuses") is not None
+        }
+        if fields:
+            manifest["fields"] = fields
+        if statuses:
+            manifest["statuses"] = statuses
+        self._set_attr_json("subscriptions", manifest)
+
+    def set_event_subscription(
+        self,
+        event_name: str,
+        fields: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+    ):
+        """
+        Narrows what Dart sends for an event.
+
+        :param event_name: Event name, e.g. `"dart_periodic_event"` or `"task_update"`.
+        :param fields: Payload fields to send. Routing fields (`task_id`, `status`,
+                       `callback_id`, `timing`) are always sent, and so are
+                       `current_step` and `total_steps` for `task_update`.
+                       None sends all fields.
+        :param statuses: For `task_update`, the statuses to send, e.g. `["progress"]`.
+                         `"complete"` and `"error"` are always sent, since they
+                         release the task's handlers. None sends all statuses.
+        """
+        if fields is not None:
+            required = _REQUIRED_FIELDS.get(event_name, ())
+            fields = list(fields) + [f for f in required if f not in fields]
+        if statuses is not None:
+            statuses = list(statuses) + [s for s in _TERMINAL_STATUSES if s not in statuses]
+        self._event_subscriptions[event_name] = {
+            "fields": fields,
+            "statuses": statuses,
+        }
+        self._update_subscriptions()
+
+    def invoke_method(
+        self,
+        method_name: str,
+        arguments: Optional[Dict[str, str]] = None,
+        wait_for_result: bool = False,
+        wait_timeout: Optional[float] = 5,
+    ) -> Optional[str]:
+        arguments, call_id = self._begin_call(method_name, arguments)
+        try:
+            if self._outbound_buffer is not None:
+                result = self._outbound_buffer.call(
+                    method_name, arguments, wait_for_result, wait_timeout
+                )
+            else:
+                result = self._invoke_method_direct(
+                    method_name, arguments, wait_for_result, wait_timeout
+                )
+        except BaseException:
+            self._discard_call(call_id)
+            raise
+        return self._end_call(call_id, result, wait_for_result)
+
+    async def invoke_method_async(
+        self,
+        method_name: str,
+        arguments: Optional[Dict[str, str]] = None,
+        wait_for_result: bool = False,
+        wait_timeout: Optional[float] = 5,
+    ) -> Optional[str]:
+        arguments, call_id = self._begin_call(method_name, arguments)
+        try:
+            if self._outbound_buffer is not None:
+                result = await self._outbound_buffer.call_async(
+                    method_name, arguments, wait_for_result, wait_timeout
+                )
+            else:
+                result = await self._invoke_method_direct_async(
+                    method_name, arguments, wait_for_result, wait_timeout
+                )
+        except BaseException:
+            self._discard_call(call_id)
+            raise
+        return self._end_call(call_id, result, wait_for_result)
+
+    # Shared by invoke_method and invoke_method_async.
+    def _begin_call(self, method_name, arguments):
+        call_id = None
+        if self._latency_tracker is not None:
+            # Dart stamps its receive/finish times on replies carrying a call id.
+            call_id = self._latency_tracker.begin(method_name)
+            arguments = dict(arguments or {}, _call_id=call_id)
+        if self._trace_recorder is not None:
+            self._trace_recorder.record_call(method_name, arguments)
+        return arguments, call_id
+
+    def _discard_call(self, call_id):
+        if call_id is not None and self._latency_tracker is not None:
+            self._latency_tracker.discard(call_id)
+
+    def _end_call(self, call_id, result, wait_for_result):
+        if call_id is not None and wait_for_result and self._latency_tracker is not None:
+            result = self._latency_tracker.unwrap_result(result, time.time())
+        return result
+
+    def _invoke_method_direct(self, method_name, arguments, wait_for_result, wait_timeout):
+        return super().invoke_method(
+            method_name,
+            arguments,
+            wait_for_result=wait_for_result,
+            wait_timeout=wait_timeout,
+        )
+
+    async def _invoke_method_direct_async(
+        self, method_name, arguments, wait_for_result, wait_timeout
+    ):
+        return await super().invoke_method_async(
+            method_name,
+            arguments,
+            wait_for_result=wait_for_result,
+            wait_timeout=wait_timeout,
+        )
+
+    # outbound buffering
+    def enable_outbound_buffer(
+        self,
+        max_size: int = 100,
+        ttl: float = 30.0,
+        idempotent_methods: Iterable[str] = DEFAULT_IDEMPOTENT_METHODS,
+    ) -> OutboundBuffer:
+        """
+        Buffers `invoke_method` calls while the Flutter client is disconnected
+        and sends them as one batch on reconnect. See `flet_package_guide.outbound`.
+
+        The control notices a disconnect when sending raises `ConnectionError`,
+        or when told with `client_disconnected()`. Call `client_reconnected()` to flush, e.g.:
+
+            page.on_disconnect = lambda e: control.client_disconnected()
+            page.on_connect = lambda e: control.client_reconnected()
+
+        :param max_size: Maximum number of buffered calls; further calls raise
+                         `OutboundBufferFullError`.
+        :param ttl: Seconds a buffered call is kept. Waiting callers get a
+                    `TimeoutError` when it expires.
+        :param idempotent_methods: Methods whose duplicate buffered calls are collapsed.
+        """
+        self._outbound_buffer = OutboundBuffer(
+            self._invoke_method_direct,
+            send_async=self._invoke_method_direct_async,
+            max_size=max_size,
+            ttl=ttl,
+            idempotent_methods=idempotent_methods,
+            on_expired=self._on_outbound_call_expired,
+            task_state=self._in_flight_tasks,
+        )
+        return self._outbound_buffer
+
+    def disable_outbound_buffer(self):
+        self._outbound_buffer = None
+
+    def client_disconnected(self):
+        """
+        Starts buffering outbound calls until `client_reconnected()`.
+        """
+        if self._outbound_buffer is not None:
+            self._outbound_buffer.disconnected()
+
+    def client_reconnected(self, wait_timeout: Optional[float] = 10):
+        """
+        Sends buffered calls, together with the last known step of every
+        in-flight progress task, as one batch. Dart answers the re-sync with the
+        tasks' current step instead of restarting them.
+        """
+        if self._outbound_buffer is not None:
+            self._outbound_buffer.reconnected(wait_timeout)
+
+    def _in_flight_tasks(self) -> Dict[str, Tuple[int, int]]:
+        # Tasks whose start call is still buffered are started by that call;
+        # re-syncing them too would make Dart run them twice.
+        unsent = set()
+        if self._outbound_buffer is not None:
+            for method_name, arguments in self._outbound_buffer.pending_calls():
+                if method_name == "start_task_with_progress":
+                    unsent.add(arguments.get("task_id"))
+                elif method_name == "start_task_group":
+                    unsent.add(arguments.get("group_id"))
+        tasks = {
+            task_id: (total, step)
+            for task_id, (total, step) in self._task_progress.items()
+            if task_id not in unsent
+        }
+        for group_id, group in list(self._task_groups.items()):
+            if group_id in unsent:
+                continue
+            for i in group.running_indices():
+                tasks[group.task_id(i)] = (group.total[i], group.step[i])
+        return tasks
+
+    def _on_outbound_call_expired(self, method_name: str, arguments: Dict[str, str]):
+        # The call never reached Dart, so no event will clean up its callbacks.
+        if method_name == "start_async_task":
+            self._async_callbacks.pop(arguments.get("callback_id"), None)
+        elif method_name == "start_task_with_progress":
+            task_id = arguments.get("task_id")
+            self._progress_handlers.pop(task_id, None)
+            self._completion_handlers.pop(task_id, None)
+            self._task_progress.pop(task_id, None)
+        elif method_name == "start_task_group":
+            self._task_groups.pop(arguments.get("group_id"), None)
+
+    # profiling
+    def enable_profiling(
+        self,
+        mode: str = SAMPLE,
+        interval: float = 0.005,
+        call_rate: float = 1.0,
+        max_task_keys: int = 256,
+    ) -> HandlerProfiler:
+        """
+        Profiles the event handlers of this control (`on_something`,
+        `on_dart_periodic_event`, and the `async_callback`/`task_update`
+        dispatch including the callbacks they call). Each handler gets its own
+        profile, and `task_update` one per task id; tasks of a task group share
+        the group's profile. See `flet_package_guide.profiling`.
+
+        :param mode: `"sample"` for a low-overhead stack sampler, `"cprofile"`
+                     for deterministic profiling with `cProfile`.
+        :param interval: Seconds between stack samples in `"sample"` mode.
+        :param call_rate: Fraction of handler calls that are profiled.
+        :param max_task_keys: Maximum number of per-task profiles kept; the
+                              least recently used one is dropped first.
+        """
+        if self._profiler is not None:
+            self._profiler.stop()
+        self._profiler = HandlerProfiler(
+            mode, interval=interval, call_rate=call_rate, max_task_keys=max_task_keys
+        )
+        return self._profiler
+
+    def disable_profiling(self) -> Optional[HandlerProfiler]:
+        """
+        Stops profiling and returns the profiler, whose results stay available.
+        """
+        profiler, self._profiler = self._profiler, None
+        if profiler is not None:
+            profiler.stop()
+        return profiler
+
+    @property
+    def profiler(self) -> Optional[HandlerProfiler]:
+        return self._profiler
+
+    def dump_profiles(self, directory: str) -> List[str]:
+        """
+        Writes the current profiles to `directory`, as collapsed stacks
+        (`.folded`) or pstats files (`.pstats`) depending on the mode.
+        Returns the paths written.
+        """
+        if self._profiler is None:
+            return []
+        return self._profiler.dump(directory)
+
+    @staticmethod
+    def _profile_key(event_name: str, e) -> ProfileKey:
+        if event_name != "task_update":
+            return (event_name, None)
+        try:
+            task_id = json.loads(e.data).get("task_id")
+        except (TypeError, ValueError, AttributeError):
+            return (event_name, None)
+        if task_id and ":" in task_id:
+            task_id = task_id.partition(":")[0]  # TaskGroup "<group_id>:<index>"
+        return (event_name, task_id or None)
+
+    # tracing
+    def start_trace(self, path: str, include_payloads: bool = True) -> TraceRecorder:
+        """
+        Starts recording every outbound `invoke_method` call and inbound event
+        of this control to a trace file. See `flet_package_guide.tracing`.
+
+        :param path: File to write. Paths ending in `.gz` are compressed.
+        :param include_payloads: Record payloads as well as sizes. Required for replay.
+        :return: The active `TraceRecorder`.
+        """
+        self.stop_trace()
+        self._trace_recorder = TraceRecorder(path, include_payloads=include_payloads)
+        return self._trace_recorder
+
+    def stop_trace(self):
+        """
+        Stops recording and closes the trace file, if a trace is active.
+        """
+        recorder, self._trace_recorder = self._trace_recorder, None
+        if recorder is not None:
+            recorder.close()
+
+    # latency tracking
+    def enable_latency_tracking(self, enabled: bool = True):
+        """
+        Turns end-to-end latency tracking on or off. While on, every
+        `invoke_method` call carries a call id, Dart stamps its receive, start
+        and finish times on the result or on the resulting
+        `async_callback`/`task_update` events, and the clock-offset-corrected
+        breakdown is added to per-method histograms.
+        """
+        if enabled and self._latency_tracker is None:
+            self._latency_tracker = LatencyTracker()
+        elif not enabled:
+            self._latency_tracker = None
+
+    @property
+    def latency_tracker(self) -> Optional[LatencyTracker]:
+        return self._latency_tracker
+
+    def latency_histograms(
+        self, method_name: Optional[str] = None
+    ) -> Dict[str, Dict[str, LatencyHistogram]]:
+        """
+        Returns latency histograms keyed by method and then by phase
+        (`request`, `dart`, `response`, `total`). Progress events are reported
+        under `"start_task_with_progress:progress"`, and tasks of task groups
+        under `"start_task_group"` and `"start_task_group:progress"`.
+
+        :param method_name: Only return the histograms of this method.
+        """
+        if self._latency_tracker is None:
+            return {}
+        return self._latency_tracker.histograms(method_name)
+
+    def _record_event_timing(self, event_data: dict, label: str, final: bool = True):
+        timing = event_data.get("timing")
+        if self._latency_tracker is not None and isinstance(timing, dict):
+            self._latency_tracker.complete(timing, time.time(), label=label, final=final)
+
     # colors
     # OK. Passing list of colors
     # FLET PYTHON SIDE
@@ -89,21 +576,29 @@ class FletPackageGuide(ConstrainedControl):
     def colors(self):
         """
         colors property description.
+
+        Colors are validated and normalized in Python: hex colors become ARGB
+        integers and names (including theme references) are kept as strings.
+        Equal lists share one interned palette whose id is sent as `palette`,
+        so Dart resolves each palette once per theme change.
         """
         return self._get_attr("colors")
 
     @colors.setter
     def colors(self, colors: Optional[List[ColorValue]]):
-        self._set_attr_json("colors", colors)
+        if self._attr_writes is not None:
+            self._attr_writes.cancel("colors")
+        palette = intern_palette(colors) if colors is not None else None
+        self._set_attr("colors", palette.json if palette else None)
+        self._set_attr("palette", palette.id if palette else None)
 
     # FLUTTER DART SIDE
-    # final String? colorListJs = control.attrString("colors", null);
-    # List<Color> colors = [Colors.red, Colors.blue, Colors.green]; // default
-    # if (colorListJs != null) {
-    #   try {
-    #     final List<dynamic> colorStrings = json.decode(colorListJs);
-    #     colors = parseColors(Theme.of(context), colorStrings);
-    #   } catch (e) {}
+    # final String? paletteId = control.attrString("palette", null);
+    # List<Color>? colors = _PaletteCache.get(theme, paletteId);
+    # if (colors == null) {
+    #   final List<dynamic> entries = json.decode(control.attrString("colors")!);
+    #   // ARGB ints -> Color(value), names -> parseColor(theme, name)
+    #   colors = _PaletteCache.put(theme, paletteId, resolve(entries));
     # }
     # ENDOK. Done passing list of colors
 
@@ -112,18 +607,31 @@ class FletPackageGuide(ConstrainedControl):
     # FLET PYTHON SIDE
     @property
     def content(self) -> Optional[Control]:
+        """
+        Replacing a mounted content control with a new control of the same type
+        recycles its place on the page: the new control takes over the id of the
+        mounted one, and the next update sends only the properties that differ
+        instead of removing one subtree and adding another. The new control
+        becomes `content`; the replaced one is detached.
+        """
         return self.__content
 
     @content.setter
     def content(self, value: Optional[Control]):
+        current = self.__content
+        if value is not None and value is not current:
+            if current is not None and _can_recycle(current, value):
+                _recycle_control(current, value)
+                # Let the next diff see the new control in the old one's place.
+                previous = self._Control__previous_children
+                previous[:] = [value if c is current else c for c in previous]
+            value._set_attr_internal("n", "content")
         self.__content = value
 
     def _get_children(self):
-        children = []
         if self.__content is not None:
-            self.__content._set_attr_internal("n", "content")
-            children.append(self.__content)
-        return children
+            return [self.__content]
+        return []
 
     # FLUTTER DART SIDE
     # var contentCtrls =
@@ -177,6 +685,8 @@ class FletPackageGuide(ConstrainedControl):
 
     @complex_data.setter
     def complex_data(self, value: Optional[Any]):
+        if self._attr_writes is not None:
+            self._attr_writes.cancel("complex_data")
         self._set_attr_json("complex_data", value=value)
 
     # FLUTTER DART SIDE
@@ -196,6 +706,38 @@ class FletPackageGuide(ConstrainedControl):
     # ENDOK. Passing complex Data (JSON)
 
 
+    # background serialization
+    # Large values can be serialized off the event loop. Only the latest value
+    # per attribute is kept while a job runs; it is applied in one step, before
+    # the caller resumes and calls update().
+    async def set_complex_data_async(
+        self, value: Optional[Any], executor: Optional[concurrent.futures.Executor] = None
+    ):
+        """
+        Sets `complex_data`, serializing it in a worker thread.
+
+        :param value: The new value.
+        :param executor: Executor to serialize in, e.g. a `ProcessPoolExecutor` for
+                         very large payloads. Defaults to a shared thread pool.
+        """
+        await self._write_attr_async("complex_data", value, serialize_complex_data, executor)
+
+    async def set_colors_async(
+        self,
+        colors: Optional[List[ColorValue]],
+        executor: Optional[concurrent.futures.Executor] = None,
+    ):
+        """
+        Sets `colors`, normalizing and serializing them in a worker thread.
+        See `set_complex_data_async()`.
+        """
+        await self._write_attr_async("colors", colors, serialize_colors, executor)
+
+    async def _write_attr_async(self, key, value, serializer, executor):
+        if self._attr_writes is None:
+            self._attr_writes = AttrWriteQueue(self)
+        await self._attr_writes.write(key, value, serializer, executor)
+
     def play(self, some:str="thing"):
         args = {"some": some}
         return self.invoke_method("play", args, wait_for_result=True)
@@ -226,6 +768,7 @@ class FletPackageGuide(ConstrainedControl):
         """
         # print(f"Python _on_async_callback received: {e.data}")
         event_data = json.loads(e.data)
+        self._record_event_timing(event_data, "start_async_task")
         callback_id = event_data.get("callback_id")
         data = event_data.get("data")
         # print(f"Callback ID: {callback_id}, Data: {data}")
@@ -306,12 +849,12 @@ class FletPackageGuide(ConstrainedControl):
             # Automatically enable periodic events in Dart if a Python handler is attached
             # and events are not already marked as enabled.
             self.enable_periodic_events = True
-        elif handler is None and self.enable_periodic_events:
-            # Optional: Disable periodic events if handler is removed
-            # self.enable_periodic_events = False
-            pass # Current behavior: keep enabled, Dart will send events but Python won't handle.
+        elif self.page:
+            # The handler changed the subscriptions manifest; removing it stops
+            # the Dart timer once the update reaches the client.
+            self.update()
 
-    def start_task_with_progress_updates(self, total_steps: int, progress_handler: callable, completion_handler: callable):
+    def start_task_with_progress_updates(self, total_steps: int, progress_handler: Optional[callable], completion_handler: callable):
         """
         Starts a task on the Dart side that will provide periodic progress updates
         and a final completion update.
@@ -319,19 +862,22 @@ class FletPackageGuide(ConstrainedControl):
         :param total_steps: The total number of steps for the task.
         :param progress_handler: A Python callable that will be invoked for each progress update.
                                  It should accept one argument: a dictionary of event data.
+                                 If None, Dart does not send progress updates for this task.
         :param completion_handler: A Python callable that will be invoked when the task is complete.
                                    It should accept one argument: a dictionary of event data.
         """
         if not isinstance(total_steps, int) or total_steps <= 0:
             raise ValueError("total_steps must be a positive integer.")
-        if not callable(progress_handler):
+        if progress_handler is not None and not callable(progress_handler):
             raise ValueError("progress_handler must be a callable function.")
         if not callable(completion_handler):
             raise ValueError("completion_handler must be a callable function.")
 
         task_id = str(uuid.uuid4())
-        self._progress_handlers[task_id] = progress_handler
+        if progress_handler is not None:
+            self._progress_handlers[task_id] = progress_handler
         self._completion_handlers[task_id] = completion_handler
+        self._task_progress[task_id] = [total_steps, 0]
 
         # We need to ensure total_steps is passed in a way Dart's _onMethodCall can parse.
         # If args are Map<String, String>, then it must be a string.
@@ -340,10 +886,62 @@ class FletPackageGuide(ConstrainedControl):
         # which implies it expects a string but can handle it.
         self.invoke_method(
             "start_task_with_progress",
-            {"task_id": task_id, "total_steps": str(total_steps)},
+            {
+                "task_id": task_id,
+                "total_steps": str(total_steps),
+                "progress": "false" if progress_handler is None else None,
+            },
         )
         return task_id # Return task_id so UI can track if needed, though example doesn't use it directly for now
 
+    def start_task_group(
+        self,
+        totals: Sequence[int],
+        on_update: Optional[TaskGroupCallable] = None,
+        on_complete: Optional[TaskGroupCallable] = None,
+        min_interval: float = 0.25,
+    ) -> TaskGroup:
+        """
+        Starts one Dart progress task per entry of `totals` and tracks them all
+        with a single `TaskGroup`, instead of a pair of handlers per task.
+
+        :param totals: Total number of steps of each task.
+        :param on_update: Called with the group at most once per `min_interval` seconds.
+        :param on_complete: Called with the group once every task has finished.
+        :param min_interval: Minimum time, in seconds, between `on_update` calls.
+        :return: The `TaskGroup`, whose aggregates can be read at any time.
+        """
+        group = TaskGroup(
+            totals,
+            on_update=on_update,
+            on_complete=on_complete,
+            min_interval=min_interval,
+        )
+        self._task_groups[group.group_id] = group
+        group._mark_started(time.monotonic())
+        self.invoke_method(
+            "start_task_group",
+            {
+                "group_id": group.group_id,
+                "total_steps": json.dumps(list(group.total), separators=(",", ":")),
+            },
+        )
+        return group
+
+    def _on_task_group_update(self, task_id: str, status: str, event_data: dict):
+        group_id, _, index = task_id.partition(":")
+        group = self._task_groups.get(group_id)
+        if group is None:
+            return
+        try:
+            group._on_task_update(int(index), status, event_data)
+        finally:
+            if group.finished:
+                self._task_groups.pop(group_id, None)
+                timing = event_data.get("timing")
+                if self._latency_tracker is not None and isinstance(timing, dict):
+                    self._latency_tracker.discard(timing.get("call_id"))
+
     def _on_task_update(self, e):
         """
         Handles 'task_update' events from Dart, routing them to the appropriate
@@ -362,7 +960,28 @@ class FletPackageGuide(ConstrainedControl):
             # print(f"Task ID missing in task_update event: {event_data}")
             return
 
+        if self._latency_tracker is not None:
+            if ":" in task_id:
+                # All tasks of a group share the start_task_group call, which
+                # is dropped from the tracker when the group finishes.
+                label = "start_task_group"
+                final = False
+            else:
+                label = "start_task_with_progress"
+                final = status != "progress"
+            if status == "progress":
+                label += ":progress"
+            self._record_event_timing(event_data, label, final=final)
+
+        if ":" in task_id:
+            # "<group_id>:<index>" ids belong to a TaskGroup.
+            self._on_task_group_update(task_id, status, event_data)
+            return
+
         if status == "progress":
+            progress = self._task_progress.get(task_id)
+            if progress is not None and "current_step" in event_data:
+                progress[1] = event_data["current_step"]
             handler = self._progress_handlers.get(task_id)
             if handler:
                 handler(event_data)
@@ -373,12 +992,91 @@ class FletPackageGuide(ConstrainedControl):
             # Clean up handlers for this task_id after completion or error
             self._progress_handlers.pop(task_id, None)
             self._completion_handlers.pop(task_id, None)
+            self._task_progress.pop(task_id, None)
         elif status == "error":
             # Optional: Handle error status if Dart sends it
             # print(f"Task error for {task_id}: {event_data.get('message')}")
             # Clean up handlers for this task_id
             self._progress_handlers.pop(task_id, None)
             self._completion_handlers.pop(task_id, None)
+            self._task_progress.pop(task_id, None)
         else:
             # print(f"Unknown status in task_update event: {status} for task {task_id}")
             pass
+
+
+def _can_recycle(current: Control, new: Control) -> bool:
+    # Controls with their own build(), did_mount() or will_unmount() expect
+    # those to run when the control is added or removed.
+    cls = type(new)
+    return (
+        cls is type(current)
+        and current.uid is not None
+        and new.uid is None
+        and cls.build is Control.build
+        and cls.did_mount is Control.did_mount
+        and cls.will_unmount is Control.will_unmount
+    )
+
+
+def _recycle_control(current: Control, new: Control):
+    """
+    Moves the mount state of `current` (id, page, parent, previous children)
+    into `new` and detaches `current`. Only attributes of `new` whose values
+    differ from those of `current` are marked dirty.
+    """
+    old_attrs = current._Control__attrs
+    attrs = {}
+    for name, (value, _) in new._Control__attrs.items():
+        prev = old_attrs.get(name)
+        # Keep pending changes of the current control dirty.
+        attrs[name] = (value, prev is None or prev[0] != value or prev[1])
+    for name, (value, _) in old_attrs.items():
+        if name not in attrs and value not in (None, ""):
+            # Unset in the new control; "" clears it, as _set_attr_internal does.
+            attrs[name] = old_attrs[name] if name == "n" else ("", True)
+    new._Control__attrs = attrs
+
+    uid, page = current.uid, current.page
+    new._Control__uid = uid
+    new.page = page
+    new.parent = current.parent
+    new._Control__previous_children = current._Control__previous_children
+    index = getattr(page, "_index", None)
+    if index is not None and index.get(uid) is current:
+        index[uid] = new
+
+    current._Control__uid = None
+    current.page = None
+    current.parent = None
+    current._Control__previous_children = []
+
+
+class FletPackageGuideTemplate:
+    """
+    Pre-built `FletPackageGuide` properties shared by many instances.
+    Created with `FletPackageGuide.template()`.
+    """
+
+    def __init__(self, control_class: type, props: Dict[str, Any]):
+        if "content" in props:
+            raise ValueError(
+                "content cannot be shared between controls; pass it when calling the template."
+            )
+        self._control_class = control_class
+        self._prototype = control_class(**props)
+
+    def __call__(self, **overrides) -> FletPackageGuide:
+        """
+        Creates a new control from the template.
+
+        :param overrides: Properties to set on this instance only.
+        """
+        control = self._prototype._clone()
+        for name, value in overrides.items():
+            if not isinstance(getattr(self._control_class, name, None), property):
+                raise TypeError(
+                    f"{self._control_class.__name__} has no property '{name}'."
+                )
+            setattr(control, name, value)
+        return control
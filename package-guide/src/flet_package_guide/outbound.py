@@ -0,0 +1,245 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# Methods whose repeated calls with the same arguments have the same effect;
+# buffered duplicates are sent once and share the result.
+DEFAULT_IDEMPOTENT_METHODS = frozenset({"play", "stop"})
+
+SendCallable = Callable[[str, Optional[Dict[str, str]], bool, Optional[float]], Optional[str]]
+AsyncSendCallable = Callable[
+    [str, Optional[Dict[str, str]], bool, Optional[float]], Awaitable[Optional[str]]
+]
+
+
+class OutboundBufferFullError(Exception):
+    """
+    Raised when a call is made while disconnected and the buffer is full.
+    """
+
+
+class _BufferedCall:
+    __slots__ = ("method_name", "arguments", "deadline", "event", "result", "error")
+
+    def __init__(self, method_name: str, arguments: Dict[str, str], deadline: float):
+        self.method_name = method_name
+        self.arguments = arguments
+        self.deadline = deadline
+        self.event = threading.Event()
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+    def resolve(self, result: Optional[str] = None, error: Optional[BaseException] = None):
+        self.result = result
+        self.error = error
+        self.event.set()
+
+
+class OutboundBuffer:
+    """
+    Holds `invoke_method` calls of a control while the Flutter client is
+    disconnected and sends them as one `invoke_batch` call on reconnect.
+
+    Calls that wait for a result block until the batch is delivered or the call
+    expires. Buffered calls to idempotent methods with the same arguments are
+    collapsed into one. Before the buffered calls, the batch re-syncs in-flight
+    progress tasks (`sync_tasks`) so Dart can report their current step instead
+    of restarting them.
+
+    The buffer starts holding calls on `disconnected()`, or when sending a call
+    raises `ConnectionError`. Any other error of a call is raised to its caller.
+    """
+
+    def __init__(
+        self,
+        send: SendCallable,
+        send_async: Optional[AsyncSendCallable] = None,
+        max_size: int = 100,
+        ttl: float = 30.0,
+        idempotent_methods: Iterable[str] = DEFAULT_IDEMPOTENT_METHODS,
+        on_expired: Optional[Callable[[str, Dict[str, str]], None]] = None,
+        task_state: Optional[Callable[[], Dict[str, Tuple[int, int]]]] = None,
+    ):
+        """
+        :param send: Sends one call to the client, like `Control.invoke_method`.
+        :param send_async: Async counterpart of `send`, used by `call_async()`.
+        :param max_size: Maximum number of buffered calls.
+        :param ttl: Seconds a buffered call is kept before it expires.
+        :param idempotent_methods: Methods whose duplicate calls may be collapsed.
+        :param on_expired: Called with the method name and arguments of each call
+                           that expires or does not fit in the buffer, so the
+                           control can drop its callbacks.
+        :param task_state: Returns `{task_id: (total_steps, last_step)}` for the
+                           in-flight progress tasks to re-sync on reconnect.
+        """
+        self._send = send
+        self._send_async = send_async
+        self.max_size = max_size
+        self.ttl = ttl
+        self.idempotent_methods: FrozenSet[str] = frozenset(idempotent_methods)
+        self._on_expired = on_expired
+        self._task_state = task_state
+        self._calls: "OrderedDict[Any, _BufferedCall]" = OrderedDict()
+        self._seq = 0
+        self._lock = threading.RLock()
+        self._connected = True
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def pending_calls(self) -> List[Tuple[str, Dict[str, str]]]:
+        """
+        The method names and arguments of the buffered calls, oldest first.
+        """
+        with self._lock:
+            return [(c.method_name, c.arguments) for c in self._calls.values()]
+
+    def call(
+        self,
+        method_name: str,
+        arguments: Optional[Dict[str, str]],
+        wait_for_result: bool,
+        wait_timeout: Optional[float],
+    ) -> Optional[str]:
+        if self._connected:
+            try:
+                return self._send(method_name, arguments, wait_for_result, wait_timeout)
+            except ConnectionError:
+                # The client is gone; keep the call for the reconnect. Errors
+                # returned by Dart, timeouts and the like are raised as is.
+                self._connected = False
+        with self._lock:
+            # The lock is held while a batch is flushed, so a call that raced
+            # with the reconnect is sent directly instead of buffered.
+            entry = None if self._connected else self._enqueue(method_name, arguments)
+        if entry is None:
+            return self._send(method_name, arguments, wait_for_result, wait_timeout)
+        return self._wait(entry) if wait_for_result else None
+
+    async def call_async(
+        self,
+        method_name: str,
+        arguments: Optional[Dict[str, str]],
+        wait_for_result: bool,
+        wait_timeout: Optional[float],
+    ) -> Optional[str]:
+        """
+        Like `call()`, for `invoke_method_async`. Waiting for a buffered call
+        happens in an executor thread, so the event loop is not blocked.
+        """
+        if self._send_async is None:
+            raise RuntimeError("OutboundBuffer was created without send_async.")
+        if self._connected:
+            try:
+                return await self._send_async(
+                    method_name, arguments, wait_for_result, wait_timeout
+                )
+            except ConnectionError:
+                self._connected = False
+        with self._lock:
+            entry = None if self._connected else self._enqueue(method_name, arguments)
+        if entry is None:
+            return await self._send_async(method_name, arguments, wait_for_result, wait_timeout)
+        if not wait_for_result:
+            return None
+        return await asyncio.get_running_loop().run_in_executor(None, self._wait, entry)
+
+    def _enqueue(self, method_name, arguments) -> _BufferedCall:
+        # Same conversion as Control.invoke_method.
+        args = {k: str(v) for k, v in (arguments or {}).items() if v is not None}
+        key = None
+        if method_name in self.idempotent_methods:
+            key = (method_name, tuple(sorted((k, v) for k, v in args.items() if k != "_call_id")))
+            existing = self._calls.get(key)
+            if existing is not None:
+                return existing
+        self._expire(time.monotonic())
+        if len(self._calls) >= self.max_size:
+            if self._on_expired is not None:
+                self._on_expired(method_name, args)
+            raise OutboundBufferFullError(
+                f"Outbound buffer is full ({self.max_size} calls); dropping {method_name}."
+            )
+        if key is None:
+            self._seq += 1
+            key = self._seq
+        entry = self._calls[key] = _BufferedCall(method_name, args, time.monotonic() + self.ttl)
+        return entry
+
+    def _wait(self, entry: _BufferedCall) -> Optional[str]:
+        if not entry.event.wait(max(entry.deadline - time.monotonic(), 0.0)):
+            with self._lock:
+                self._expire(time.monotonic())
+            if not entry.event.is_set():
+                raise TimeoutError(
+                    f"Timeout waiting for client reconnect to send {entry.method_name}"
+                )
+        if entry.error is not None:
+            raise entry.error
+        return entry.result
+
+    def _expire(self, now: float):
+        for key in [k for k, c in self._calls.items() if c.deadline <= now]:
+            entry = self._calls.pop(key)
+            if self._on_expired is not None:
+                self._on_expired(entry.method_name, entry.arguments)
+            entry.resolve(
+                error=TimeoutError(f"{entry.method_name} expired while the client was disconnected")
+            )
+
+    def disconnected(self):
+        self._connected = False
+
+    def reconnected(self, wait_timeout: Optional[float] = 10):
+        """
+        Marks the client as connected and flushes the buffer as one batch.
+        If the client is unreachable (`ConnectionError`), the calls stay
+        buffered. Any other error fails every buffered call and is raised.
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            entries: List[_BufferedCall] = list(self._calls.values())
+            calls = [{"method": c.method_name, "args": c.arguments} for c in entries]
+            tasks = self._task_state() if self._task_state is not None else {}
+            if tasks:
+                calls.insert(
+                    0,
+                    {
+                        "method": "sync_tasks",
+                        "args": {"tasks": json.dumps(tasks, separators=(",", ":"))},
+                    },
+                )
+            if not calls:
+                self._connected = True
+                return
+            try:
+                raw = self._send(
+                    "invoke_batch",
+                    {"calls": json.dumps(calls, separators=(",", ":"))},
+                    True,
+                    wait_timeout,
+                )
+            except ConnectionError:
+                self._connected = False
+                raise
+            except Exception as ex:
+                self._calls.clear()
+                self._connected = True
+                for entry in entries:
+                    entry.resolve(error=ex)
+                raise
+            self._calls.clear()
+            self._connected = True
+
+        results = json.loads(raw) if raw else []
+        if tasks:
+            results = results[1:]
+        for i, entry in enumerate(entries):
+            entry.resolve(results[i] if i < len(results) else None)
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import threading
+from enum import Enum
+from typing import Dict, Sequence, Tuple, Union
+
+from flet.core.colors import Colors
+from flet.core.cupertino_colors import CupertinoColors
+from flet.core.types import ColorValue
+
+# A normalized color: an ARGB integer, or a symbolic name that Dart resolves
+# (theme references like "primary", palette names like "red400"), optionally
+# with an ",opacity" suffix.
+NormalizedColor = Union[int, str]
+
+_KNOWN_NAMES = frozenset(
+    c.value.lower() for c in list(Colors) + list(CupertinoColors)
+)
+
+
+def _parse_opacity(text: str, value) -> float:
+    try:
+        opacity = float(text)
+    except ValueError:
+        raise ValueError(f"Invalid opacity in color {value!r}.") from None
+    if not 0.0 <= opacity <= 1.0:
+        raise ValueError(f"Opacity must be between 0 and 1 in color {value!r}.")
+    return opacity
+
+
+def normalize_color(value: ColorValue) -> NormalizedColor:
+    """
+    Validates a color value and converts it to its compact form.
+
+    Hex strings (`"#RRGGBB"`, `"#AARRGGBB"`, optionally with an `",opacity"`
+    suffix) become ARGB integers. Named colors are kept as strings, since theme
+    references can only be resolved by Dart.
+
+    :raises ValueError: If the value is not a valid color.
+    """
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid color {value!r}.")
+    if isinstance(value, int):
+        if not 0 <= value <= 0xFFFFFFFF:
+            raise ValueError(f"ARGB color {value!r} is out of range.")
+        return value
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid color {value!r}.")
+
+    color, sep, opacity_text = value.strip().partition(",")
+    color = color.strip()
+    opacity = _parse_opacity(opacity_text.strip(), value) if sep else None
+
+    if color.startswith("#"):
+        digits = color[1:]
+        if len(digits) not in (6, 8):
+            raise ValueError(f"Hex color {value!r} must be #RRGGBB or #AARRGGBB.")
+        try:
+            argb = int(digits, 16)
+        except ValueError:
+            raise ValueError(f"Invalid hex color {value!r}.") from None
+        if len(digits) == 6:
+            argb |= 0xFF000000
+        if opacity is not None:
+            argb = (round(opacity * 255) << 24) | (argb & 0x00FFFFFF)
+        return argb
+
+    name = color.lower()
+    if name not in _KNOWN_NAMES:
+        raise ValueError(f"Unknown color name {value!r}.")
+    return f"{name},{opacity}" if opacity is not None else name
+
+
+class Palette:
+    """
+    An interned, normalized list of colors.
+
+    `id` is derived from the content, so the same colors get the same id in
+    every session and Dart can cache the resolved colors under it.
+    """
+
+    __slots__ = ("id", "colors", "json")
+
+    def __init__(self, colors: Tuple[NormalizedColor, ...]):
+        self.colors = colors
+        self.json = json.dumps(list(colors), separators=(",", ":"))
+        self.id = hashlib.blake2b(self.json.encode("utf-8"), digest_size=8).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self.colors)
+
+    def __repr__(self) -> str:
+        return f"Palette({self.id}, {list(self.colors)!r})"
+
+
+_palettes: Dict[Tuple, Palette] = {}
+_palettes_by_content: Dict[Tuple[NormalizedColor, ...], Palette] = {}
+_lock = threading.Lock()
+_MAX_PALETTES = 4096
+
+
+def intern_palette(colors: Sequence[ColorValue]) -> Palette:
+    """
+    Returns the shared `Palette` for a list of colors, normalizing it only the
+    first time this list is seen.
+
+    :raises ValueError: If any color is invalid.
+    """
+    key = tuple(c.value if isinstance(c, Enum) else c for c in colors)
+    try:
+        palette = _palettes.get(key)
+    except TypeError:
+        raise ValueError(f"Invalid colors {list(colors)!r}.") from None
+    if palette is not None:
+        return palette
+
+    normalized = tuple(normalize_color(c) for c in key)
+    with _lock:
+        if len(_palettes) >= _MAX_PALETTES:
+            _palettes.clear()
+            _palettes_by_content.clear()
+        palette = _palettes_by_content.get(normalized)
+        if palette is None:
+            palette = _palettes_by_content[normalized] = Palette(normalized)
+        _palettes[key] = palette
+    return palette
+
+
+def palette_count() -> int:
+    return len(_palettes_by_content)
@@ -0,0 +1,325 @@
+import cProfile
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+SAMPLE = "sample"
+CPROFILE = "cprofile"
+
+# (handler name, task id or None)
+ProfileKey = Tuple[str, Optional[str]]
+
+_SKIPPED = object()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+class HandlerProfiler:
+    """
+    Profiles the event handlers of a control, keeping a separate profile per
+    handler and per task id.
+
+    In `"sample"` mode a background thread takes a snapshot of the stacks of
+    the threads that are running a handler every `interval` seconds, and
+    counts identical stacks. The overhead is independent of how much Python
+    code the handlers run. Profiles are dumped as collapsed stacks, the input
+    format of flamegraph.pl, speedscope and similar tools.
+
+    In `"cprofile"` mode calls run under `cProfile`, which records every
+    function call and is much slower. Only one call is profiled at a time;
+    calls made while another one is being profiled run unprofiled and are not
+    counted. On Python 3.12 and later cProfile records every thread while it is
+    enabled, so functions that other threads run at the same time can show up
+    in the profile. Profiles are dumped as pstats files.
+
+    Coroutine handlers are profiled only while they run, not while they are
+    suspended, so other tasks of the event loop do not end up in their profile.
+
+    At most `max_task_keys` per-task profiles are kept; the least recently used
+    one is dropped when a new task id comes in.
+    """
+
+    def __init__(
+        self,
+        mode: str = SAMPLE,
+        interval: float = 0.005,
+        call_rate: float = 1.0,
+        max_task_keys: int = 256,
+    ):
+        """
+        :param mode: `"sample"` or `"cprofile"`.
+        :param interval: Seconds between two stack samples in `"sample"` mode.
+        :param call_rate: Fraction of handler calls that are profiled, from 0 to 1.
+        :param max_task_keys: Maximum number of per-task profiles kept.
+        """
+        if mode not in (SAMPLE, CPROFILE):
+            raise ValueError(f"Unknown profiling mode {mode!r}; use 'sample' or 'cprofile'.")
+        if interval <= 0:
+            raise ValueError("interval must be positive.")
+        if not 0.0 <= call_rate <= 1.0:
+            raise ValueError("call_rate must be between 0 and 1.")
+        self.mode = mode
+        self.interval = interval
+        self.call_rate = call_rate
+        self.max_task_keys = max_task_keys
+        self._lock = threading.Lock()
+        # thread id -> (key, frame the handler was entered from)
+        self._active: Dict[int, Tuple[ProfileKey, Any]] = {}
+        self._samples: Dict[ProfileKey, Counter] = {}
+        self._profiles: Dict[ProfileKey, cProfile.Profile] = {}
+        self._calls: Counter = Counter()
+        # Per-task keys, least recently used first.
+        self._task_keys: "OrderedDict[ProfileKey, None]" = OrderedDict()
+        # Held while a call runs under cProfile; one at a time per interpreter.
+        self._cprofile_lock = threading.Lock()
+        self._sampler: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    # entering and leaving handlers
+    def _use_key(self, key: ProfileKey) -> bool:
+        # Called with self._lock held. False if the key has been evicted.
+        if key[1] is None:
+            return True
+        if key in self._task_keys:
+            self._task_keys.move_to_end(key)
+            return True
+        return False
+
+    def _add_key(self, key: ProfileKey):
+        # Called with self._lock held.
+        if key[1] is None or key in self._task_keys:
+            self._use_key(key)
+            return
+        self._task_keys[key] = None
+        while len(self._task_keys) > self.max_task_keys:
+            old, _ = self._task_keys.popitem(last=False)
+            self._samples.pop(old, None)
+            self._profiles.pop(old, None)
+            self._calls.pop(old, None)
+
+    def _enter(self, key: ProfileKey, frame) -> Any:
+        """
+        Starts profiling the current thread under `key`. Returns a token for
+        `_exit()`, or `_SKIPPED` if this call is not profiled.
+        """
+        tid = threading.get_ident()
+        if self.mode == SAMPLE:
+            with self._lock:
+                self._add_key(key)
+            previous = self._active.get(tid)
+            self._active[tid] = (key, frame)
+            if self._sampler is None:
+                self._start_sampler()
+            return previous
+        if not self._cprofile_lock.acquire(blocking=False):
+            return _SKIPPED  # Another call is being profiled.
+        with self._lock:
+            self._add_key(key)
+            profile = self._profiles.get(key)
+            if profile is None:
+                profile = self._profiles[key] = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler, e.g. a debugger, is active.
+            self._cprofile_lock.release()
+            return _SKIPPED
+        return profile
+
+    def _exit(self, token: Any):
+        if token is _SKIPPED:
+            return
+        if self.mode == SAMPLE:
+            tid = threading.get_ident()
+            if token is None:
+                self._active.pop(tid, None)
+            else:
+                self._active[tid] = token
+        else:
+            token.disable()
+            self._cprofile_lock.release()
+
+    def _count(self, key: ProfileKey):
+        with self._lock:
+            if self._use_key(key):
+                self._calls[key] += 1
+
+    def _should_profile(self) -> bool:
+        if self._stopped.is_set():
+            return False
+        return self.call_rate >= 1.0 or random.random() < self.call_rate
+
+    def run(self, key: ProfileKey, fn: Callable[..., Any], *args) -> Any:
+        """
+        Calls `fn(*args)`, profiling it under `key`.
+        """
+        if not self._should_profile():
+            return fn(*args)
+        token = self._enter(key, sys._getframe())
+        if token is not _SKIPPED:
+            self._count(key)
+        try:
+            return fn(*args)
+        finally:
+            self._exit(token)
+
+    async def run_async(self, key: ProfileKey, fn: Callable[..., Awaitable], *args) -> Any:
+        """
+        Awaits `fn(*args)`, profiling each step of the coroutine under `key`.
+        """
+        if not self._should_profile():
+            return await fn(*args)
+        return await _ProfiledCoroutine(self, key, fn(*args))
+
+    # sampling
+    def _start_sampler(self):
+        with self._lock:
+            if self._sampler is None:
+                self._sampler = threading.Thread(
+                    target=self._sample_loop, name="flet_package_guide_profiler", daemon=True
+                )
+                self._sampler.start()
+
+    def _sample_loop(self):
+        while not self._stopped.wait(self.interval):
+            if not self._active:
+                continue
+            frames = sys._current_frames()
+            for tid, (key, entry) in list(self._active.items()):
+                frame = frames.get(tid)
+                stack = []
+                while frame is not None and frame is not entry:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if not stack:
+                    continue
+                stack.reverse()
+                with self._lock:
+                    if not self._use_key(key):
+                        continue  # Evicted while running.
+                    counts = self._samples.get(key)
+                    if counts is None:
+                        counts = self._samples[key] = Counter()
+                    counts[";".join(stack)] += 1
+
+    # results
+    def keys(self) -> List[ProfileKey]:
+        with self._lock:
+            return sorted(set(self._calls), key=lambda k: (k[0], k[1] or ""))
+
+    def calls(self, key: ProfileKey) -> int:
+        """
+        Number of profiled calls made under `key`.
+        """
+        return self._calls.get(key, 0)
+
+    def collapsed(self, key: ProfileKey) -> Dict[str, int]:
+        """
+        Sample counts by stack (frames joined with `;`, outermost first) for
+        `"sample"` mode.
+        """
+        with self._lock:
+            return dict(self._samples.get(key, {}))
+
+    def stats(self, key: ProfileKey) -> Optional[pstats.Stats]:
+        """
+        The `pstats.Stats` of `key` for `"cprofile"` mode, or None if nothing
+        was recorded.
+        """
+        with self._lock:
+            profile = self._profiles.get(key)
+        if profile is None:
+            return None
+        try:
+            return pstats.Stats(profile)
+        except TypeError:
+            return None  # Nothing recorded yet.
+
+    def dump(self, directory: str) -> List[str]:
+        """
+        Writes one file per profile to `directory`: `<handler>[.<task_id>].folded`
+        in `"sample"` mode, `<handler>[.<task_id>].pstats` in `"cprofile"` mode.
+        Returns the paths written.
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for key in self.keys():
+            handler, task_id = key
+            name = handler if task_id is None else f"{handler}.{task_id}"
+            name = re.sub(r"[^\w.-]", "_", name)
+            if self.mode == SAMPLE:
+                samples = self.collapsed(key)
+                if not samples:
+                    continue
+                path = os.path.join(directory, name + ".folded")
+                with open(path, "w", encoding="utf-8") as f:
+                    for stack, count in sorted(samples.items()):
+                        f.write(f"{stack} {count}\n")
+            else:
+                stats = self.stats(key)
+                if stats is None:
+                    continue
+                path = os.path.join(directory, name + ".pstats")
+                stats.dump_stats(path)
+            paths.append(path)
+        return paths
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._calls.clear()
+            self._task_keys.clear()
+            # Profiles still enabled are disabled by their handler and dropped.
+            self._profiles.clear()
+
+    def stop(self):
+        """
+        Stops profiling new calls and the sampler thread. Results stay available.
+        """
+        self._stopped.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+
+class _ProfiledCoroutine:
+    """
+    Drives a coroutine step by step, profiling only the steps. The call is
+    counted on the first step that is profiled.
+    """
+
+    def __init__(self, profiler: HandlerProfiler, key: ProfileKey, coro):
+        self._profiler = profiler
+        self._key = key
+        self._coro = coro
+
+    def __await__(self):
+        profiler, coro = self._profiler, self._coro
+        value, error = None, None
+        counted = False
+        while True:
+            token = profiler._enter(self._key, sys._getframe())
+            if not counted and token is not _SKIPPED:
+                profiler._count(self._key)
+                counted = True
+            try:
+                if error is not None:
+                    yielded = coro.throw(error)
+                else:
+                    yielded = coro.send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                profiler._exit(token)
+            try:
+                value, error = (yield yielded), None
+            except BaseException as ex:
+                value, error = None, ex
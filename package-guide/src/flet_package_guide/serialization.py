@@ -0,0 +1,148 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from flet.core.embed_json_encoder import EmbedJsonEncoder
+
+from flet_package_guide.palette import intern_palette
+
+# Serializers run in a worker thread or process and return the attributes to
+# set, so values that map to several attributes are applied together. They are
+# module-level functions so a ProcessPoolExecutor can pickle them.
+Serializer = Callable[[Any], Dict[str, Optional[str]]]
+
+
+def serialize_complex_data(value: Any) -> Dict[str, Optional[str]]:
+    return {
+        "complex_data": (
+            json.dumps(value, cls=EmbedJsonEncoder, separators=(",", ":"))
+            if value is not None
+            else None
+        )
+    }
+
+
+def serialize_colors(colors: Any) -> Dict[str, Optional[str]]:
+    palette = intern_palette(colors) if colors is not None else None
+    return {
+        "colors": palette.json if palette else None,
+        "palette": palette.id if palette else None,
+    }
+
+
+_default_executor: Optional[ThreadPoolExecutor] = None
+_default_executor_lock = threading.Lock()
+
+
+def default_executor() -> ThreadPoolExecutor:
+    """
+    The thread pool used when no executor is given. It is shared by all controls.
+    """
+    global _default_executor
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="flet_package_guide_serialize"
+            )
+        return _default_executor
+
+
+class _Slot:
+    __slots__ = ("value", "version", "cancelled", "waiters")
+
+    def __init__(self):
+        self.value: Any = None
+        self.version = 0
+        self.cancelled = False
+        self.waiters: List[asyncio.Future] = []
+
+
+class AttrWriteQueue:
+    """
+    Serializes attribute values of one control off the event loop.
+
+    There is at most one job per attribute. A write that arrives while a job is
+    running replaces any value still waiting, so only the first and the latest
+    values are serialized. When the latest value is ready, its attributes are
+    written in one step, and every caller that wrote to the attribute meanwhile
+    is resumed.
+    """
+
+    def __init__(self, control):
+        self._control = control
+        self._slots: Dict[str, _Slot] = {}
+        self._lock = threading.Lock()
+
+    def pending(self, key: str) -> bool:
+        return key in self._slots
+
+    async def write(
+        self,
+        key: str,
+        value: Any,
+        serializer: Serializer,
+        executor: Optional[Executor] = None,
+    ):
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        with self._lock:
+            slot = self._slots.get(key)
+            start = slot is None
+            if start:
+                slot = self._slots[key] = _Slot()
+            slot.value = value
+            slot.version += 1
+            slot.cancelled = False
+            slot.waiters.append(waiter)
+        if start:
+            loop.create_task(self._run(key, slot, serializer, executor))
+        await waiter
+
+    def cancel(self, key: str):
+        """
+        Drops a pending write, e.g. because the attribute was set synchronously.
+        Callers waiting on it are resumed without the value being applied.
+        """
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is not None:
+                slot.cancelled = True
+                slot.version += 1
+
+    async def _run(
+        self, key: str, slot: _Slot, serializer: Serializer, executor: Optional[Executor]
+    ):
+        loop = asyncio.get_running_loop()
+        executor = executor or default_executor()
+        while True:
+            with self._lock:
+                if slot.cancelled:
+                    waiters = self._finish(key, slot)
+                    break
+                value, version = slot.value, slot.version
+            try:
+                attrs = await loop.run_in_executor(executor, serializer, value)
+            except Exception as ex:
+                with self._lock:
+                    waiters = self._finish(key, slot)
+                for w in waiters:
+                    if not w.done():
+                        w.set_exception(ex)
+                return
+            with self._lock:
+                if slot.version != version:
+                    continue  # A newer value (or a cancel) arrived meanwhile.
+                for name, encoded in attrs.items():
+                    self._control._set_attr(name, encoded)
+                waiters = self._finish(key, slot)
+                break
+        for w in waiters:
+            if not w.done():
+                w.set_result(None)
+
+    def _finish(self, key: str, slot: _Slot) -> List[asyncio.Future]:
+        self._slots.pop(key, None)
+        waiters, slot.waiters = slot.waiters, []
+        return waiters
@@ -0,0 +1,239 @@
+import threading
+import time
+import uuid
+from array import array
+from typing import Callable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; aggregates fall back to plain Python.
+    np = None
+
+# Per-task status codes stored in `TaskGroup.status`.
+PENDING = 0
+RUNNING = 1
+COMPLETE = 2
+ERROR = 3
+
+TaskGroupCallable = Callable[["TaskGroup"], None]
+
+
+class TaskGroup:
+    """
+    A group of Dart progress tasks tracked with one handler.
+
+    Per-task state lives in flat arrays indexed by task number (`step`, `total`,
+    `status`, `started`, `updated`), and the group totals are kept up to date
+    on every event, so memory is a few bytes per task and most aggregates are
+    O(1). Task ids sent to Dart are `"<group_id>:<index>"`.
+
+    Instances are created with `FletPackageGuide.start_task_group()`.
+    """
+
+    def __init__(
+        self,
+        totals: Sequence[int],
+        on_update: Optional[TaskGroupCallable] = None,
+        on_complete: Optional[TaskGroupCallable] = None,
+        min_interval: float = 0.25,
+    ):
+        """
+        :param totals: Total number of steps of each task.
+        :param on_update: Called with the group at most once per `min_interval`
+                          seconds while tasks progress. An update that falls
+                          inside the interval is delivered at its end.
+        :param on_complete: Called once with the group when every task has
+                            completed or failed.
+        :param min_interval: Minimum time, in seconds, between `on_update` calls.
+        """
+        if not totals:
+            raise ValueError("totals must not be empty.")
+        if any(not isinstance(t, int) or t <= 0 for t in totals):
+            raise ValueError("every total must be a positive integer.")
+
+        self.group_id = uuid.uuid4().hex
+        self.on_update = on_update
+        self.on_complete = on_complete
+        self.min_interval = min_interval
+
+        n = len(totals)
+        self.total = array("l", totals)
+        self.step = array("l", [0]) * n
+        self.status = array("b", [PENDING]) * n
+        self.started = array("d", [0.0]) * n
+        self.updated = array("d", [0.0]) * n
+
+        self._steps_done = 0
+        self._steps_total = sum(totals)
+        self._status_counts = [n, 0, 0, 0]
+        self._start_time: Optional[float] = None
+        self._last_fired = 0.0
+        self._flush_timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.total)
+
+    def task_id(self, index: int) -> str:
+        return f"{self.group_id}:{index}"
+
+    def _mark_started(self, now: float):
+        n = len(self.total)
+        self._start_time = now
+        self.started = array("d", [now]) * n
+        self.updated = array("d", [now]) * n
+        self.status = array("b", [RUNNING]) * n
+        self._status_counts = [0, n, 0, 0]
+
+    # event handling
+    def _on_task_update(self, index: int, status: str, event_data: dict):
+        if not 0 <= index < len(self.total):
+            return
+        now = time.monotonic()
+        with self._lock:
+            prev = self.status[index]
+            if prev in (COMPLETE, ERROR):
+                return
+            if status == "progress":
+                if "current_step" not in event_data:
+                    return
+                new_step = min(int(event_data["current_step"]), self.total[index])
+                self._steps_done += new_step - self.step[index]
+                self.step[index] = new_step
+            elif status == "complete":
+                self._steps_done += self.total[index] - self.step[index]
+                self.step[index] = self.total[index]
+                self._set_status(index, prev, COMPLETE)
+            elif status == "error":
+                self._set_status(index, prev, ERROR)
+            else:
+                return
+            self.updated[index] = now
+
+            finished = self.finished
+            wait = self.min_interval - (now - self._last_fired)
+            fire = finished or wait <= 0
+            if fire:
+                self._last_fired = now
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+            elif self._flush_timer is None and self.on_update is not None:
+                # Deliver the suppressed update once the interval is over.
+                self._flush_timer = threading.Timer(wait, self._flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+        if fire and self.on_update is not None:
+            self.on_update(self)
+        if finished and self.on_complete is not None:
+            self.on_complete(self)
+
+    def _flush(self):
+        with self._lock:
+            if self._flush_timer is None:
+                return  # An event fired the update in the meantime.
+            self._flush_timer = None
+            self._last_fired = time.monotonic()
+        self.on_update(self)
+
+    def _set_status(self, index: int, prev: int, new: int):
+        self._status_counts[prev] -= 1
+        self._status_counts[new] += 1
+        self.status[index] = new
+
+    # aggregates
+    @property
+    def completed_count(self) -> int:
+        return self._status_counts[COMPLETE]
+
+    @property
+    def error_count(self) -> int:
+        return self._status_counts[ERROR]
+
+    @property
+    def running_count(self) -> int:
+        return self._status_counts[RUNNING]
+
+    @property
+    def finished(self) -> bool:
+        return self._status_counts[COMPLETE] + self._status_counts[ERROR] == len(
+            self.total
+        )
+
+    @property
+    def progress(self) -> float:
+        """
+        Overall progress between 0.0 and 1.0, weighted by step count.
+        """
+        return self._steps_done / self._steps_total
+
+    @property
+    def elapsed(self) -> float:
+        if self._start_time is None:
+            return 0.0
+        return time.monotonic() - self._start_time
+
+    @property
+    def eta(self) -> Optional[float]:
+        """
+        Estimated seconds until every task finishes, from the average step
+        rate so far. None until the first step has been reported.
+        """
+        elapsed = self.elapsed
+        if self._steps_done == 0 or elapsed <= 0:
+            return None
+        rate = self._steps_done / elapsed
+        return (self._steps_total - self._steps_done) / rate
+
+    def stalled_count(self, threshold: float = 5.0) -> int:
+        """
+        Number of running tasks that have not reported for `threshold` seconds.
+        """
+        cutoff = time.monotonic() - threshold
+        with self._lock:
+            if np is not None:
+                status = np.frombuffer(self.status, dtype=np.int8)
+                updated = np.frombuffer(self.updated, dtype=np.float64)
+                return int(np.count_nonzero((status == RUNNING) & (updated < cutoff)))
+            return sum(
+                1
+                for s, u in zip(self.status, self.updated)
+                if s == RUNNING and u < cutoff
+            )
+
+    def running_indices(self) -> List[int]:
+        """
+        Indices of tasks that are still running.
+        """
+        with self._lock:
+            if np is not None:
+                status = np.frombuffer(self.status, dtype=np.int8)
+                return np.flatnonzero(status == RUNNING).tolist()
+            return [i for i, s in enumerate(self.status) if s == RUNNING]
+
+    def stalled_indices(self, threshold: float = 5.0) -> List[int]:
+        """
+        Indices of running tasks that have not reported for `threshold` seconds.
+        """
+        cutoff = time.monotonic() - threshold
+        with self._lock:
+            if np is not None:
+                status = np.frombuffer(self.status, dtype=np.int8)
+                updated = np.frombuffer(self.updated, dtype=np.float64)
+                return np.flatnonzero((status == RUNNING) & (updated < cutoff)).tolist()
+            return [
+                i
+                for i, (s, u) in enumerate(zip(self.status, self.updated))
+                if s == RUNNING and u < cutoff
+            ]
+
+    def summary(self) -> dict:
+        return {
+            "tasks": len(self.total),
+            "running": self.running_count,
+            "complete": self.completed_count,
+            "error": self.error_count,
+            "progress": self.progress,
+            "eta_s": self.eta,
+        }
@@ -0,0 +1,415 @@
+import asyncio
+import heapq
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from flet.core.control_event import ControlEvent
+
+# Same as _FletPackageGuideControlState._routingFields, _requiredFields and
+# _terminalStatuses.
+_ROUTING_FIELDS = frozenset({"task_id", "status", "callback_id", "timing"})
+_REQUIRED_FIELDS = {"task_update": frozenset({"current_step", "total_steps"})}
+_TERMINAL_STATUSES = frozenset({"complete", "error"})
+
+
+class _CallTiming:
+    """
+    Dart's `_CallTiming`: receive time of a call made with a `_call_id`.
+    """
+
+    __slots__ = ("call_id", "received")
+
+    def __init__(self, call_id: str):
+        self.call_id = call_id
+        self.received = int(time.time() * 1e6)
+
+    def to_json(self) -> dict:
+        return {
+            "call_id": self.call_id,
+            "received": self.received,
+            "finished": int(time.time() * 1e6),
+        }
+
+
+def _with_timing(payload: dict, timing: Optional[_CallTiming]) -> dict:
+    if timing is not None:
+        payload["timing"] = timing.to_json()
+    return payload
+
+
+class SimulatedClient:
+    """
+    A stand-in for a Flet page and its Flutter client, for load tests and
+    offline experiments with `FletPackageGuide` controls.
+
+    Controls attached with `attach()` can call `invoke_method()`,
+    `invoke_method_async()` and `update()` as if they were on a page. Method calls are answered by a script that mirrors
+    `_FletPackageGuideControlState` (play, stop, start_async_task,
+    long_running_task, start_task_with_progress, start_task_group, invoke_batch,
+    sync_tasks, the periodic timer), with every Dart delay multiplied by
+    `time_scale`. Like Dart, the script honours the control's subscriptions
+    manifest and stamps `timing` on events of calls made with a `_call_id`.
+    Events are handed to the control's handlers on a thread pool, like
+    `Page.on_event_async` does.
+    """
+
+    def __init__(self, time_scale: float = 1.0, max_workers: int = 8):
+        """
+        :param time_scale: Factor applied to the simulated Dart delays, e.g.
+                           `0.01` turns the one-second progress steps into 10 ms.
+        :param max_workers: Threads used to run event handlers.
+        """
+        self.time_scale = time_scale
+        self.controls: Dict[str, object] = {}
+        self.calls = 0
+        self.events = 0
+        self.updates = 0
+        self.connected = True
+        self._task_steps: Dict[str, int] = {}
+        self._finished_tasks: Dict[str, None] = {}  # insertion-ordered set
+        self._periodic_timers: Dict[str, int] = {}  # control id -> timer generation
+        self._periodic_counters: Dict[str, int] = {}
+        self._manifests: Dict[str, Tuple] = {}
+        self._ids = itertools.count(1)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._timers: List = []  # heap of (due, seq, callable)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._scheduler = threading.Thread(target=self._run_scheduler, daemon=True)
+        self._scheduler.start()
+
+    # page API used by controls
+    def attach(self, control):
+        """
+        Puts `control` on this simulated page.
+        """
+        uid = f"_{next(self._ids)}"
+        # Flet's page assigns the control id the same way when it is added.
+        control._Control__uid = uid
+        control.page = self
+        self.controls[uid] = control
+        self._update_periodic_timer(uid)
+        return control
+
+    def detach(self, control):
+        self.controls.pop(control.uid, None)
+        control.page = None
+
+    def update(self, *controls):
+        self.updates += 1
+        for control in controls:
+            if control.uid in self.controls:
+                self._update_periodic_timer(control.uid)
+
+    def disconnect(self):
+        """
+        Simulates a lost connection: method calls raise `ConnectionError` and
+        events are dropped until `reconnect()`.
+        """
+        self.connected = False
+
+    def reconnect(self):
+        self.connected = True
+
+    def _invoke_method(
+        self,
+        method_name: str,
+        arguments: Optional[Dict[str, str]] = None,
+        control_id: Optional[str] = "",
+        wait_for_result: Optional[bool] = False,
+        wait_timeout: Optional[float] = 5,
+    ) -> Optional[str]:
+        if not self.connected:
+            raise ConnectionError("Simulated client is disconnected")
+        self.calls += 1
+        args = arguments or {}
+        timing = _CallTiming(args["_call_id"]) if "_call_id" in args else None
+        handler = getattr(self, f"_dart_{method_name}", None)
+        duration, result = handler(control_id, args, timing) if handler else (0.0, None)
+
+        if wait_for_result and duration > 0:
+            if wait_timeout is not None and duration > wait_timeout:
+                time.sleep(wait_timeout)
+                raise TimeoutError(
+                    f"Timeout waiting for invokeMethod {method_name}({arguments}) call"
+                )
+            time.sleep(duration)
+        if timing is not None:
+            # Same envelope as Dart's _onMethodCall with latency tracking on.
+            result = json.dumps({"result": result, "timing": timing.to_json()})
+        if not wait_for_result:
+            return None
+        return result
+
+    async def _invoke_method_async(
+        self,
+        method_name: str,
+        arguments: Optional[Dict[str, str]] = None,
+        control_id: Optional[str] = "",
+        wait_for_result: Optional[bool] = False,
+        wait_timeout: Optional[float] = 5,
+    ) -> Optional[str]:
+        # The script sleeps for simulated Dart work; keep it off the event loop.
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            self._invoke_method,
+            method_name,
+            arguments,
+            control_id,
+            wait_for_result,
+            wait_timeout,
+        )
+
+    # scripted Dart behavior; each returns (duration in seconds, result)
+    def _dart_play(self, control_id, args, timing):
+        return 0.0, "you call play" + args.get("some", "")
+
+    def _dart_stop(self, control_id, args, timing):
+        return 0.0, "you call stop" + args.get("love", "")
+
+    def _dart_long_running_task(self, control_id, args, timing):
+        duration = int(args.get("duration_ms", "0") or 0) / 1000.0 * self.time_scale
+        return duration, (
+            f"Task completed for: '{args.get('data', 'No data')}'"
+            f" after {args.get('duration_ms', '0')} ms"
+        )
+
+    def _dart_start_async_task(self, control_id, args, timing):
+        callback_id = args.get("callback_id", "")
+        data = f"Async task for '{args.get('message', 'No message')}' completed"
+        self._schedule(
+            2.0,
+            lambda: self._emit_event(
+                control_id,
+                "async_callback",
+                lambda: _with_timing({"callback_id": callback_id, "data": data}, timing),
+            ),
+        )
+        return 0.0, None
+
+    def _dart_start_task_with_progress(self, control_id, args, timing):
+        total = int(args.get("total_steps", "0") or 0)
+        self._start_task(
+            control_id,
+            args.get("task_id", ""),
+            total,
+            args.get("progress") != "false",
+            timing,
+        )
+        return 0.0, None
+
+    def _dart_start_task_group(self, control_id, args, timing):
+        group_id = args.get("group_id", "")
+        for i, total in enumerate(json.loads(args.get("total_steps", "[]"))):
+            self._start_task(control_id, f"{group_id}:{i}", total, True, timing)
+        return 0.0, None
+
+    def _dart_invoke_batch(self, control_id, args, timing):
+        results = [
+            self._invoke_method(call["method"], call["args"], control_id, True, None)
+            for call in json.loads(args.get("calls", "[]"))
+        ]
+        return 0.0, json.dumps(results)
+
+    def _dart_sync_tasks(self, control_id, args, timing):
+        for task_id, (total, last_step) in json.loads(args.get("tasks", "{}")).items():
+            step = self._task_steps.get(task_id)
+            if step is not None:
+                self._emit_task(control_id, task_id, "progress", step, total, None)
+            elif task_id in self._finished_tasks:
+                self._emit_task(control_id, task_id, "complete", total, total, None)
+            else:
+                self._start_task(control_id, task_id, total, True, None, last_step + 1)
+        return 0.0, None
+
+    def _emit_task(self, control_id, task_id, status, step, total_steps, timing):
+        def payload():
+            if status == "progress":
+                data = {
+                    "task_id": task_id,
+                    "status": "progress",
+                    "current_step": step,
+                    "total_steps": total_steps,
+                }
+            elif status == "complete":
+                data = {
+                    "task_id": task_id,
+                    "status": "complete",
+                    "message": f"Task {task_id} finished successfully"
+                    f" after {total_steps} steps.",
+                }
+            else:
+                data = {
+                    "task_id": task_id,
+                    "status": "error",
+                    "message": "Invalid parameters for task creation.",
+                }
+            return _with_timing(data, timing)
+
+        self._emit_event(control_id, "task_update", payload, status)
+
+    def _start_task(self, control_id, task_id, total_steps, progress, timing, start_step=1):
+        if not task_id or total_steps <= 0:
+            self._emit_task(control_id, task_id, "error", 0, total_steps, timing)
+            return
+
+        def step(i):
+            if i <= total_steps:
+                self._task_steps[task_id] = i
+                if progress:
+                    self._emit_task(control_id, task_id, "progress", i, total_steps, timing)
+                self._schedule(1.0, lambda: step(i + 1))
+            else:
+                self._task_steps.pop(task_id, None)
+                self._finished_tasks[task_id] = None
+                if len(self._finished_tasks) > 1000:
+                    del self._finished_tasks[next(iter(self._finished_tasks))]
+                self._emit_task(
+                    control_id, task_id, "complete", total_steps, total_steps, timing
+                )
+
+        self._task_steps[task_id] = start_step - 1
+        self._schedule(1.0, lambda: step(start_step))
+
+    # periodic timer
+    def _update_periodic_timer(self, control_id):
+        # Like Dart's _updatePeriodicTimer: runs while periodic events are
+        # enabled and subscribed, and is re-checked on every update.
+        control = self.controls.get(control_id)
+        wanted = (
+            control is not None
+            and control.enable_periodic_events
+            and self._is_subscribed(control, "dart_periodic_event")
+        )
+        if not wanted:
+            self._periodic_timers.pop(control_id, None)
+        elif control_id not in self._periodic_timers:
+            generation = self._periodic_timers[control_id] = next(self._seq)
+            self._schedule(1.0, lambda: self._periodic_tick(control_id, generation))
+
+    def _periodic_tick(self, control_id, generation):
+        self._update_periodic_timer(control_id)
+        if self._periodic_timers.get(control_id) != generation:
+            return  # Cancelled, or replaced by a newer timer.
+        counter = self._periodic_counters[control_id] = (
+            self._periodic_counters.get(control_id, 0) + 1
+        )
+        self._emit_event(control_id, "dart_periodic_event", lambda: {"counter": counter})
+        self._schedule(1.0, lambda: self._periodic_tick(control_id, generation))
+
+    # subscriptions
+    def _manifest(self, control):
+        raw = control._get_attr("subscriptions")
+        if raw is None:
+            return None
+        manifest = self._manifests.get(raw)
+        if manifest is None:
+            data = json.loads(raw)
+            manifest = (
+                set(data.get("events", [])),
+                {k: set(v) for k, v in data.get("fields", {}).items()},
+                {k: set(v) for k, v in data.get("statuses", {}).items()},
+            )
+            if len(self._manifests) > 256:
+                self._manifests.clear()
+            self._manifests[raw] = manifest
+        return manifest
+
+    def _is_subscribed(self, control, event_name, status=None) -> bool:
+        manifest = self._manifest(control)
+        if manifest is None:
+            return True
+        events, _, statuses = manifest
+        if event_name not in events:
+            return False
+        allowed = statuses.get(event_name)
+        return (
+            status is None
+            or allowed is None
+            or status in allowed
+            or status in _TERMINAL_STATUSES
+        )
+
+    def _emit_event(
+        self,
+        control_id: str,
+        event_name: str,
+        build_payload: Callable[[], dict],
+        status: Optional[str] = None,
+    ):
+        # Mirrors Dart's _emitEvent: only subscribed events and statuses are
+        # sent, and payloads are trimmed to the subscribed fields.
+        control = self.controls.get(control_id)
+        if control is None or not self._is_subscribed(control, event_name, status):
+            return
+        payload = build_payload()
+        manifest = self._manifest(control)
+        fields = manifest[1].get(event_name) if manifest is not None else None
+        if fields is not None:
+            required = _REQUIRED_FIELDS.get(event_name, frozenset())
+            payload = {
+                k: v
+                for k, v in payload.items()
+                if k in fields or k in _ROUTING_FIELDS or k in required
+            }
+        self.emit(control_id, event_name, json.dumps(payload))
+
+    # events
+    def emit(self, control_id: str, event_name: str, data: Optional[str]):
+        """
+        Sends an event to a control, as Dart's `triggerControlEvent` would.
+        The subscriptions manifest is not applied.
+        """
+        control = self.controls.get(control_id)
+        if control is None or not self.connected:
+            return
+        handler = control.event_handlers.get(event_name)
+        if handler is None:
+            return
+        self.events += 1
+        e = ControlEvent(control_id, event_name, data, control, self)
+        self._executor.submit(handler, e)
+
+    # scheduler
+    def _schedule(self, dart_seconds: float, fn: Callable[[], None]):
+        due = time.monotonic() + dart_seconds * self.time_scale
+        with self._cond:
+            heapq.heappush(self._timers, (due, next(self._seq), fn))
+            self._cond.notify()
+
+    def _run_scheduler(self):
+        while True:
+            with self._cond:
+                while not self._closed and (
+                    not self._timers or self._timers[0][0] > time.monotonic()
+                ):
+                    timeout = (
+                        self._timers[0][0] - time.monotonic() if self._timers else None
+                    )
+                    self._cond.wait(timeout)
+                if self._closed:
+                    return
+                _, _, fn = heapq.heappop(self._timers)
+            fn()
+
+    @property
+    def pending_timers(self) -> int:
+        return len(self._timers)
+
+    def close(self):
+        """
+        Stops the scheduler and the handler threads.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._scheduler.join()
+        self._executor.shutdown(wait=True)
+        for control in list(self.controls.values()):
+            control.page = None
+        self.controls.clear()
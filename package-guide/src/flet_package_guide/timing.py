@@ -0,0 +1,224 @@
+import bisect
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+# Phases of a timed call, in the order they happen.
+#   request:  Python send -> Dart `_onMethodCall` entry (transport to Dart)
+#   dart:     `_onMethodCall` entry -> finish of the Dart work (result
+#             returned or event sent)
+#   response: Dart finish -> Python receive (transport back to Python)
+#   total:    Python send -> Python receive
+PHASES = ("request", "dart", "response", "total")
+
+# Bucket upper bounds in milliseconds, spaced by sqrt(2) from 10us to ~170s.
+_BUCKET_BOUNDS: List[float] = [0.01 * (2 ** (i / 2.0)) for i in range(49)]
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram. Values are in milliseconds.
+
+    Percentiles are interpolated within buckets, so they are accurate to about
+    the bucket width (a factor of sqrt(2)).
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value_ms: float):
+        value_ms = max(value_ms, 0.0)
+        self.counts[bisect.bisect_left(_BUCKET_BOUNDS, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        self.min = value_ms if self.min is None else min(self.min, value_ms)
+        self.max = value_ms if self.max is None else max(self.max, value_ms)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lo = _BUCKET_BOUNDS[i - 1] if i > 0 else 0.0
+                hi = _BUCKET_BOUNDS[i] if i < len(_BUCKET_BOUNDS) else self.max
+                value = lo + (hi - lo) * ((rank - seen) / n)
+                return min(max(value, self.min), self.max)
+            seen += n
+        return self.max
+
+    def buckets(self) -> List[Tuple[float, int]]:
+        """
+        Non-empty buckets as `(upper_bound_ms, count)` pairs. The overflow
+        bucket has an upper bound of `float("inf")`.
+        """
+        bounds = _BUCKET_BOUNDS + [float("inf")]
+        return [(bounds[i], n) for i, n in enumerate(self.counts) if n]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": self.mean,
+            "min_ms": self.min or 0.0,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max or 0.0,
+        }
+
+
+class ClockOffsetEstimator:
+    """
+    Estimates the offset of the Dart clock relative to the Python clock from
+    round trips, NTP style: the sample with the smallest network delay among
+    the most recent ones wins.
+    """
+
+    def __init__(self, window: int = 32):
+        self._samples = deque(maxlen=window)
+
+    def add(self, t0: float, t1: float, t2: float, t3: float):
+        """
+        :param t0: Python send time.
+        :param t1: Dart receive time.
+        :param t2: Dart finish time.
+        :param t3: Python receive time.
+        """
+        offset = ((t1 - t0) + (t2 - t3)) / 2.0
+        delay = (t3 - t0) - (t2 - t1)
+        self._samples.append((delay, offset))
+
+    @property
+    def offset(self) -> float:
+        """
+        Seconds to subtract from a Dart timestamp to get Python time.
+        """
+        if not self._samples:
+            return 0.0
+        return min(self._samples)[1]
+
+
+class LatencyTracker:
+    """
+    Correlates Python send/receive times with the timestamps Dart adds to
+    method results and events, and keeps per-method histograms of each phase.
+
+    Dart timestamps are microseconds since the epoch; Python uses `time.time()`.
+    """
+
+    def __init__(self, max_pending: int = 1024):
+        self.clock = ClockOffsetEstimator()
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._pending: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._max_pending = max_pending
+        self._lock = threading.Lock()
+
+    def begin(self, method_name: str) -> str:
+        """
+        Registers an outbound call and returns the call id to send to Dart.
+        """
+        call_id = uuid.uuid4().hex
+        with self._lock:
+            self._pending[call_id] = (method_name, time.time())
+            while len(self._pending) > self._max_pending:
+                self._pending.popitem(last=False)
+        return call_id
+
+    def discard(self, call_id: str):
+        with self._lock:
+            self._pending.pop(call_id, None)
+
+    def complete(
+        self,
+        timing: Dict[str, Any],
+        received_at: float,
+        label: Optional[str] = None,
+        final: bool = True,
+    ):
+        """
+        Records the breakdown for a timed reply.
+
+        :param timing: The `timing` object sent by Dart.
+        :param received_at: Python receive time (`time.time()`).
+        :param label: Histogram key. Defaults to the method name of the call.
+        :param final: If False the call stays pending, e.g. for progress events.
+        """
+        call_id = timing.get("call_id")
+        with self._lock:
+            pending = (
+                self._pending.pop(call_id, None)
+                if final
+                else self._pending.get(call_id)
+            )
+            if pending is None:
+                return
+            method_name, sent_at = pending
+            t1 = timing["received"] / 1e6
+            t2 = timing["finished"] / 1e6
+            self.clock.add(sent_at, t1, t2, received_at)
+            offset = self.clock.offset
+
+            phases = self._histograms.get(label or method_name)
+            if phases is None:
+                phases = self._histograms[label or method_name] = {
+                    p: LatencyHistogram() for p in PHASES
+                }
+            phases["request"].add((t1 - offset - sent_at) * 1000.0)
+            phases["dart"].add((t2 - t1) * 1000.0)
+            phases["response"].add((received_at - (t2 - offset)) * 1000.0)
+            phases["total"].add((received_at - sent_at) * 1000.0)
+
+    def unwrap_result(self, result: Optional[str], received_at: float) -> Optional[str]:
+        """
+        Strips the timing envelope Dart puts around method results, records
+        it and returns the original result.
+        """
+        if result is None:
+            return None
+        try:
+            envelope = json.loads(result)
+            timing = envelope["timing"]
+            inner = envelope["result"]
+        except (json.JSONDecodeError, TypeError, KeyError):
+            # Not a timed reply (e.g. an older Dart build); pass it through.
+            return result
+        self.complete(timing, received_at)
+        return inner
+
+    def histograms(
+        self, method_name: Optional[str] = None
+    ) -> Dict[str, Dict[str, LatencyHistogram]]:
+        """
+        Histograms keyed by method (or label) and then by phase.
+        """
+        with self._lock:
+            if method_name is not None:
+                phases = self._histograms.get(method_name)
+                return {method_name: phases} if phases else {}
+            return dict(self._histograms)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "clock_offset_ms": self.clock.offset * 1000.0,
+                "methods": {
+                    name: {p: h.summary() for p, h in phases.items()}
+                    for name, phases in self._histograms.items()
+                },
+            }
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
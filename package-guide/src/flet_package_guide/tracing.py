@@ -0,0 +1,274 @@
+import asyncio
+import gzip
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from flet.core.control_event import ControlEvent
+
+TRACE_FORMAT = "flet_package_guide.trace"
+TRACE_VERSION = 1
+
+# Direction markers used in trace records.
+OUTBOUND = "out"  # Python -> Dart invoke_method call
+INBOUND = "in"  # Dart -> Python control event
+
+
+class TraceRecord(NamedTuple):
+    """
+    A single entry of a trace file.
+
+    :param t: Seconds since the recorder was started.
+    :param direction: `"out"` for an `invoke_method` call, `"in"` for an event from Dart.
+    :param name: Method name (outbound) or event name (inbound).
+    :param size: Payload size in bytes.
+    :param payload: Method arguments (outbound) or raw event data (inbound).
+    """
+
+    t: float
+    direction: str
+    name: str
+    size: int
+    payload: Any
+
+
+def _open_trace(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class TraceRecorder:
+    """
+    Writes a compact trace of the traffic of a `FletPackageGuide` control.
+
+    The file is JSON lines: a header object followed by one array per record,
+    `[t, direction, name, size, payload]`. Paths ending in `.gz` are compressed.
+    Recording is thread-safe, since Flet runs event handlers in a thread pool.
+    """
+
+    def __init__(self, path: str, include_payloads: bool = True):
+        """
+        :param path: File to write the trace to. It is truncated if it exists.
+        :param include_payloads: If False, only sizes are written and the trace
+                                 cannot be replayed.
+        """
+        self.path = path
+        self.include_payloads = include_payloads
+        self._lock = threading.Lock()
+        self._file = _open_trace(path, "w")
+        self._t0 = time.perf_counter()
+        self._file.write(
+            json.dumps(
+                {
+                    "format": TRACE_FORMAT,
+                    "version": TRACE_VERSION,
+                    "started": time.time(),
+                    "payloads": include_payloads,
+                },
+                separators=(",", ":"),
+            )
+            + "\n"
+        )
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def record_call(self, method_name: str, arguments: Optional[Dict[str, Any]]):
+        """
+        Records an outbound `invoke_method` call.
+        """
+        encoded = json.dumps(arguments, separators=(",", ":")) if arguments else ""
+        self._write(OUTBOUND, method_name, len(encoded.encode("utf-8")), arguments)
+
+    def record_event(self, event_name: str, data: Optional[str]):
+        """
+        Records an inbound control event.
+        """
+        size = len(data.encode("utf-8")) if data else 0
+        self._write(INBOUND, event_name, size, data)
+
+    def _write(self, direction: str, name: str, size: int, payload: Any):
+        t = round(time.perf_counter() - self._t0, 6)
+        line = json.dumps(
+            [t, direction, name, size, payload if self.include_payloads else None],
+            separators=(",", ":"),
+        )
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + "\n")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_trace(path: str) -> Tuple[Dict[str, Any], List[TraceRecord]]:
+    """
+    Reads a trace file written by `TraceRecorder`.
+
+    :return: A `(header, records)` tuple.
+    """
+    with _open_trace(path, "r") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != TRACE_FORMAT:
+            raise ValueError(f"{path} is not a FletPackageGuide trace file.")
+        if header.get("version") != TRACE_VERSION:
+            raise ValueError(
+                f"Unsupported trace version {header.get('version')} in {path}."
+            )
+        records = [TraceRecord(*json.loads(line)) for line in f if line.strip()]
+    return header, records
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+class HandlerStats:
+    """
+    Latency samples of one event handler collected during a replay.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: List[float] = []  # seconds
+        self.errors = 0
+
+    def summary(self) -> Dict[str, Any]:
+        values = sorted(self.latencies)
+        count = len(values)
+        return {
+            "count": count,
+            "errors": self.errors,
+            "mean_ms": (sum(values) / count * 1000.0) if count else 0.0,
+            "p50_ms": _percentile(values, 50) * 1000.0,
+            "p95_ms": _percentile(values, 95) * 1000.0,
+            "p99_ms": _percentile(values, 99) * 1000.0,
+            "max_ms": (values[-1] * 1000.0) if count else 0.0,
+        }
+
+
+class ReplayReport:
+    """
+    Result of `TraceReplayer.replay()`.
+    """
+
+    def __init__(self):
+        self.handlers: Dict[str, HandlerStats] = {}
+        self.events = 0
+        self.unhandled = 0
+        self.calls = 0
+        self.wall_time = 0.0
+
+    @property
+    def busy_time(self) -> float:
+        """
+        Total time, in seconds, spent inside handlers.
+        """
+        return sum(sum(s.latencies) for s in self.handlers.values())
+
+    @property
+    def throughput(self) -> float:
+        """
+        Events handled per second of wall time.
+        """
+        return self.events / self.wall_time if self.wall_time > 0 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "events": self.events,
+            "unhandled": self.unhandled,
+            "calls": self.calls,
+            "wall_time_s": self.wall_time,
+            "busy_time_s": self.busy_time,
+            "throughput_eps": self.throughput,
+            "handlers": {
+                name: stats.summary() for name, stats in self.handlers.items()
+            },
+        }
+
+
+class TraceReplayer:
+    """
+    Feeds the inbound events of a trace back into a control's handlers without
+    a page or a Flutter client, and measures how long each handler takes.
+
+    Outbound calls are not sent anywhere. Pass `on_call` to `replay()` to react
+    to them, for example to register progress handlers under the recorded
+    `task_id` so that the following `task_update` events reach them.
+    """
+
+    def __init__(self, records: List[TraceRecord]):
+        self.records = records
+
+    @classmethod
+    def from_file(cls, path: str) -> "TraceReplayer":
+        header, records = read_trace(path)
+        if not header.get("payloads", True):
+            raise ValueError(f"{path} was recorded without payloads.")
+        return cls(records)
+
+    def replay(
+        self,
+        control,
+        speed: Optional[float] = 1.0,
+        on_call: Optional[Callable[[TraceRecord], None]] = None,
+    ) -> ReplayReport:
+        """
+        Replays the trace into `control`.
+
+        :param control: The `FletPackageGuide` instance whose handlers receive the events.
+        :param speed: Time scale. `1.0` keeps the original pacing, `10.0` runs ten
+                      times faster, and `None` or `0` replays back-to-back.
+        :param on_call: Optional callable invoked with every outbound record.
+        :return: A `ReplayReport` with per-handler latencies and throughput.
+        """
+        report = ReplayReport()
+        start = time.perf_counter()
+        first_t = self.records[0].t if self.records else 0.0
+
+        for record in self.records:
+            if speed:
+                delay = (record.t - first_t) / speed - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+
+            if record.direction == OUTBOUND:
+                report.calls += 1
+                if on_call is not None:
+                    on_call(record)
+                continue
+
+            report.events += 1
+            handler = control._get_event_handler(record.name)
+            if handler is None:
+                report.unhandled += 1
+                continue
+
+            stats = report.handlers.get(record.name)
+            if stats is None:
+                stats = report.handlers[record.name] = HandlerStats(record.name)
+
+            e = ControlEvent(control.uid, record.name, record.payload, control, None)
+            t = time.perf_counter()
+            try:
+                if asyncio.iscoroutinefunction(handler):
+                    asyncio.run(handler(e))
+                else:
+                    handler(e)
+            except Exception:
+                stats.errors += 1
+            stats.latencies.append(time.perf_counter() - t)
+
+        report.wall_time = time.perf_counter() - start
+        return report
@@ -0,0 +1,252 @@
+// Headless performance suite for FletPackageGuideControl.
+//
+// Run from src/flutter/flet_package_guide:
+//
+//   flutter test benchmark/flet_package_guide_benchmark.dart \
+//       --dart-define=BENCHMARK_OUTPUT=build/benchmark.json
+//
+// Results are printed and written as JSON to BENCHMARK_OUTPUT
+// (default: build/flet_package_guide_benchmark.json).
+
+import 'dart:convert';
+import 'dart:io';
+
+import 'package:flet/flet.dart';
+import 'package:flet_package_guide/src/flet_package_guide.dart';
+import 'package:flutter/material.dart';
+import 'package:flutter_test/flutter_test.dart';
+
+import 'mock_backend.dart';
+
+const String outputPath = String.fromEnvironment("BENCHMARK_OUTPUT",
+    defaultValue: "build/flet_package_guide_benchmark.json");
+
+const List<String> _palette = ["red", "blue", "green", "amber", "primary"];
+
+final Map<String, dynamic> results = {};
+
+Control makeControl(
+    {int colorCount = 3, int complexDataKeys = 0, bool periodic = false}) {
+  return Control(
+    id: "_1",
+    pid: "page",
+    type: "flet_package_guide",
+    name: null,
+    childIds: const [],
+    attrs: {
+      "colors": json.encode(
+          List.generate(colorCount, (i) => _palette[i % _palette.length])),
+      if (complexDataKeys > 0)
+        "complex_data": json.encode({
+          for (int i = 0; i < complexDataKeys; i++) "key$i": {"v": i}
+        }),
+      if (periodic) "enableperiodicevents": "true",
+    },
+  );
+}
+
+Widget host(Control control, MockFletControlBackend backend) {
+  return MaterialApp(
+    home: Scaffold(
+      body: SingleChildScrollView(
+        child: FletPackageGuideControl(
+          parent: null,
+          control: control,
+          children: const [],
+          parentDisabled: false,
+          parentAdaptive: null,
+          backend: backend,
+        ),
+      ),
+    ),
+  );
+}
+
+Map<String, dynamic> stats(List<int> micros) {
+  final sorted = [...micros]..sort();
+  double pct(double p) =>
+      sorted[((sorted.length - 1) * p).round()].toDouble() / 1000.0;
+  return {
+    "runs": sorted.length,
+    "mean_ms": sorted.reduce((a, b) => a + b) / sorted.length / 1000.0,
+    "p50_ms": pct(0.5),
+    "p90_ms": pct(0.9),
+    "max_ms": sorted.last / 1000.0,
+  };
+}
+
+void main() {
+  const int rebuilds = 50;
+
+  tearDownAll(() {
+    final report = {
+      "suite": "flet_package_guide",
+      "timestamp": DateTime.now().toUtc().toIso8601String(),
+      "dart": Platform.version,
+      "results": results,
+    };
+    final encoded = const JsonEncoder.withIndent("  ").convert(report);
+    final file = File(outputPath);
+    file.parent.createSync(recursive: true);
+    file.writeAsStringSync(encoded);
+    // ignore: avoid_print
+    print(encoded);
+  });
+
+  group("build", () {
+    for (final colorCount in [1, 10, 100]) {
+      for (final keys in [0, 100, 1000]) {
+        testWidgets("colors=$colorCount complex_data=$keys", (tester) async {
+          final backend = MockFletControlBackend();
+          final control =
+              makeControl(colorCount: colorCount, complexDataKeys: keys);
+
+          final sw = Stopwatch()..start();
+          await tester.pumpWidget(host(control, backend));
+          final firstBuild = sw.elapsedMicroseconds;
+
+          // Rebuild with a fresh Control object, as Flet does on every update.
+          final times = <int>[];
+          for (int i = 0; i < rebuilds; i++) {
+            final next =
+                makeControl(colorCount: colorCount, complexDataKeys: keys);
+            sw.reset();
+            await tester.pumpWidget(host(next, backend));
+            times.add(sw.elapsedMicroseconds);
+          }
+
+          results["build/colors=$colorCount/complex_data=$keys"] = {
+            "first_build_ms": firstBuild / 1000.0,
+            "rebuild": stats(times),
+          };
+          await tester.pumpWidget(const SizedBox());
+        });
+      }
+    }
+  });
+
+  group("method dispatch", () {
+    for (final method in ["play", "long_running_task"]) {
+      testWidgets(method, (tester) async {
+        final backend = MockFletControlBackend();
+        await tester.pumpWidget(host(makeControl(), backend));
+        final handler = backend.methodHandlers["_1"]!;
+        final args = method == "play"
+            ? {"some": "x"}
+            : {"data": "x", "duration_ms": "0"};
+
+        const int calls = 20000;
+        final elapsed = await tester.runAsync(() async {
+          final sw = Stopwatch()..start();
+          for (int i = 0; i < calls; i++) {
+            await handler(method, args);
+          }
+          return sw.elapsedMicroseconds;
+        });
+
+        results["dispatch/$method"] = {
+          "calls": calls,
+          "total_ms": elapsed! / 1000.0,
+          "calls_per_s": calls / (elapsed / 1e6),
+        };
+        await tester.pumpWidget(const SizedBox());
+      });
+    }
+
+    testWidgets("play with latency tracking", (tester) async {
+      final backend = MockFletControlBackend();
+      await tester.pumpWidget(host(makeControl(), backend));
+      final handler = backend.methodHandlers["_1"]!;
+
+      const int calls = 20000;
+      final elapsed = await tester.runAsync(() async {
+        final sw = Stopwatch()..start();
+        for (int i = 0; i < calls; i++) {
+          await handler("play", {"some": "x", "_call_id": "c$i"});
+        }
+        return sw.elapsedMicroseconds;
+      });
+
+      results["dispatch/play+timing"] = {
+        "calls": calls,
+        "total_ms": elapsed! / 1000.0,
+        "calls_per_s": calls / (elapsed / 1e6),
+      };
+      await tester.pumpWidget(const SizedBox());
+    });
+  });
+
+  group("event emission", () {
+    testWidgets("periodic timer", (tester) async {
+      final backend = MockFletControlBackend();
+      await tester.pumpWidget(host(makeControl(periodic: true), backend));
+
+      const int ticks = 2000;
+      final sw = Stopwatch()..start();
+      for (int i = 0; i < ticks; i++) {
+        await tester.pump(const Duration(seconds: 1));
+      }
+      final elapsed = sw.elapsedMicroseconds;
+
+      results["events/dart_periodic_event"] = {
+        "events": backend.eventCounts["dart_periodic_event"] ?? 0,
+        "bytes": backend.eventBytes,
+        "total_ms": elapsed / 1000.0,
+        "us_per_event": elapsed / ticks,
+      };
+      await tester.pumpWidget(const SizedBox());
+    });
+
+    for (final tasks in [1, 100, 1000]) {
+      testWidgets("progress tasks=$tasks", (tester) async {
+        final backend = MockFletControlBackend();
+        await tester.pumpWidget(host(makeControl(), backend));
+        final handler = backend.methodHandlers["_1"]!;
+
+        const int steps = 10;
+        final sw = Stopwatch()..start();
+        await handler("start_task_group", {
+          "group_id": "g",
+          "total_steps": json.encode(List.filled(tasks, steps)),
+        });
+        for (int i = 0; i <= steps; i++) {
+          await tester.pump(const Duration(seconds: 1));
+        }
+        final elapsed = sw.elapsedMicroseconds;
+        final events = backend.eventCounts["task_update"] ?? 0;
+
+        results["events/task_update/tasks=$tasks"] = {
+          "events": events,
+          "bytes": backend.eventBytes,
+          "total_ms": elapsed / 1000.0,
+          "events_per_s": events / (elapsed / 1e6),
+        };
+        expect(events, tasks * (steps + 1));
+        await tester.pumpWidget(const SizedBox());
+      });
+    }
+
+    testWidgets("on_something fan-out", (tester) async {
+      final backend = MockFletControlBackend();
+      await tester.pumpWidget(host(makeControl(colorCount: 10), backend));
+
+      const int taps = 500;
+      final tiles = find.descendant(
+          of: find.byType(FletPackageGuideControl),
+          matching: find.byType(GestureDetector));
+      final sw = Stopwatch()..start();
+      for (int i = 0; i < taps; i++) {
+        await tester.tap(tiles.at(i % 10), warnIfMissed: false);
+      }
+      final elapsed = sw.elapsedMicroseconds;
+
+      results["events/on_something"] = {
+        "events": backend.eventCounts["on_something"] ?? 0,
+        "state_updates": backend.stateUpdates,
+        "total_ms": elapsed / 1000.0,
+        "us_per_tap": elapsed / taps,
+      };
+      await tester.pumpWidget(const SizedBox());
+    });
+  });
+}
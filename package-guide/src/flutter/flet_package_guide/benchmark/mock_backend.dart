@@ -0,0 +1,51 @@
+import 'package:flet/flet.dart';
+
+typedef MethodHandler = Future<String?> Function(
+    String methodName, Map<String, String> args);
+
+/// A [FletControlBackend] that records what the control sends instead of
+/// talking to a Flet server.
+///
+/// Members are handled in [noSuchMethod] so the mock does not depend on the
+/// exact signatures of the backend interface; unused members return null.
+class MockFletControlBackend implements FletControlBackend {
+  final Map<String, MethodHandler> methodHandlers = {};
+  final Map<String, int> eventCounts = {};
+  int eventBytes = 0;
+  int stateUpdates = 0;
+
+  int get totalEvents => eventCounts.values.fold(0, (a, b) => a + b);
+
+  void reset() {
+    eventCounts.clear();
+    eventBytes = 0;
+    stateUpdates = 0;
+  }
+
+  @override
+  dynamic noSuchMethod(Invocation invocation) {
+    final args = invocation.positionalArguments;
+    switch (invocation.memberName) {
+      case #triggerControlEvent:
+        final String eventName = args[1] as String;
+        eventCounts[eventName] = (eventCounts[eventName] ?? 0) + 1;
+        if (args.length > 2 && args[2] is String) {
+          eventBytes += (args[2] as String).length;
+        }
+        return null;
+      case #updateControlState:
+        stateUpdates++;
+        return null;
+      case #subscribeMethods:
+        methodHandlers[args[0] as String] = args[1] as MethodHandler;
+        return null;
+      case #unsubscribeMethods:
+        methodHandlers.remove(args[0] as String);
+        return null;
+      case #isLoading:
+        return false;
+      default:
+        return null;
+    }
+  }
+}
@@ -1,8 +1,68 @@
 import 'dart:async'; // Import for Timer
+import 'dart:collection';
 import 'package:flet/flet.dart';
 import 'package:flutter/material.dart';
 import 'dart:convert';
 
+/// Timestamps (microseconds since epoch) of a call made with latency
+/// tracking enabled on the Python side, i.e. with a `_call_id` argument.
+class _CallTiming {
+  final String callId;
+  final int received;
+
+  _CallTiming(this.callId) : received = DateTime.now().microsecondsSinceEpoch;
+
+  Map<String, dynamic> toJson() => {
+        "call_id": callId,
+        "received": received,
+        "finished": DateTime.now().microsecondsSinceEpoch,
+      };
+}
+
+/// Session-wide cache of resolved palettes, keyed by the palette id Python
+/// sends next to `colors`. A Flutter client serves a single Flet session, so a
+/// static map is shared by every control of the session. Entries are resolved
+/// against the current color scheme and dropped when it changes.
+class _PaletteCache {
+  static const int _maxEntries = 256;
+  static ColorScheme? _colorScheme;
+  static final Map<String, (String, List<Color>)> _resolved = {};
+
+  static List<Color> resolve(
+      ThemeData theme, String? paletteId, String colorsJson) {
+    if (theme.colorScheme != _colorScheme) {
+      _resolved.clear();
+      _colorScheme = theme.colorScheme;
+    }
+    if (paletteId != null) {
+      final cached = _resolved[paletteId];
+      // Also check the source, in case `palette` and `colors` were updated
+      // in different messages.
+      if (cached != null && cached.$1 == colorsJson) {
+        return cached.$2;
+      }
+    }
+    final List<dynamic> entries = json.decode(colorsJson);
+    final List<Color> colors = [];
+    for (final entry in entries) {
+      // ARGB integers are normalized in Python; names need the theme.
+      final Color? color = entry is int
+          ? Color(entry)
+          : parseColor(theme, entry?.toString());
+      if (color != null) {
+        colors.add(color);
+      }
+    }
+    if (paletteId != null) {
+      if (_resolved.length >= _maxEntries) {
+        _resolved.clear();
+      }
+      _resolved[paletteId] = (colorsJson, colors);
+    }
+    return colors;
+  }
+}
+
 class FletPackageGuideControl extends StatefulWidget {
   final Control? parent;
   final Control control;
@@ -31,10 +91,46 @@ class _FletPackageGuideControlState extends State<FletPackageGuideControl> {
   Timer? _periodicTimer;
   int _periodicCounter = 0;
 
+  // Subscription manifest from the "subscriptions" attribute: the events,
+  // statuses and payload fields Python has handlers for. A null event set
+  // means no manifest was sent, and every event is emitted.
+  Set<String>? _subscribedEvents;
+  Map<String, Set<String>> _subscribedFields = {};
+  Map<String, Set<String>> _subscribedStatuses = {};
+  // Fields Python needs to route an event; never trimmed.
+  static const Set<String> _routingFields = {
+    "task_id",
+    "status",
+    "callback_id",
+    "timing"
+  };
+  // Fields an event always carries, since Python tracks progress with them.
+  static const Map<String, Set<String>> _requiredFields = {
+    "task_update": {"current_step", "total_steps"}
+  };
+  // task_update statuses that end a task; always sent, since Python releases
+  // the task's handlers on them.
+  static const Set<String> _terminalStatuses = {"complete", "error"};
+
+  // Current step of running progress tasks, and the ids of recently finished
+  // ones, so a "sync_tasks" call after a reconnect can report where each task
+  // is instead of restarting it.
+  final Map<String, int> _taskSteps = {};
+  final LinkedHashSet<String> _finishedTasks = LinkedHashSet();
+  static const int _maxFinishedTasks = 1000;
+
+  // The content widget, built once and shared by every color tile. It is kept
+  // across rebuilds while the content control and the inherited flags stay
+  // the same, so Flutter skips the content subtree when only this control
+  // changed; the content still rebuilds itself on its own updates.
+  Widget? _contentWidget;
+  (String, bool, bool?)? _contentKey;
+
   @override
   void initState() {
     super.initState();
     widget.backend.subscribeMethods(widget.control.id, _onMethodCall);
+    _readSubscriptions();
     // Initialize complexData as before
     final String? complexDataJson =
         widget.control.attrString("complex_data", null);
@@ -56,38 +152,110 @@ class _FletPackageGuideControlState extends State<FletPackageGuideControl> {
     super.dispose();
   }
 
+  void _readSubscriptions() {
+    _subscribedEvents = null;
+    _subscribedFields = {};
+    _subscribedStatuses = {};
+    final String? subscriptionsJson =
+        widget.control.attrString("subscriptions", null);
+    if (subscriptionsJson == null) {
+      return;
+    }
+    try {
+      final Map<String, dynamic> manifest = json.decode(subscriptionsJson);
+      _subscribedEvents = Set<String>.from(manifest["events"] ?? const []);
+      (manifest["fields"] as Map<String, dynamic>? ?? {}).forEach(
+          (event, fields) => _subscribedFields[event] = Set<String>.from(fields));
+      (manifest["statuses"] as Map<String, dynamic>? ?? {}).forEach(
+          (event, statuses) =>
+              _subscribedStatuses[event] = Set<String>.from(statuses));
+    } catch (e) {
+      debugPrint("Error: invalid subscriptions manifest: $e");
+    }
+  }
+
+  bool _isSubscribed(String eventName, [String? status]) {
+    if (_subscribedEvents != null && !_subscribedEvents!.contains(eventName)) {
+      return false;
+    }
+    final Set<String>? statuses = _subscribedStatuses[eventName];
+    return status == null ||
+        statuses == null ||
+        statuses.contains(status) ||
+        _terminalStatuses.contains(status);
+  }
+
+  /// Sends an event to Python if it is subscribed. The payload is only built
+  /// when it will be sent, and is trimmed to the subscribed fields.
+  void _emitEvent(String eventName, Map<String, dynamic> Function() buildPayload,
+      {String? status}) {
+    if (!_isSubscribed(eventName, status)) {
+      return;
+    }
+    Map<String, dynamic> payload = buildPayload();
+    final Set<String>? fields = _subscribedFields[eventName];
+    if (fields != null) {
+      final Set<String> required = _requiredFields[eventName] ?? const {};
+      payload = {
+        for (final entry in payload.entries)
+          if (fields.contains(entry.key) ||
+              _routingFields.contains(entry.key) ||
+              required.contains(entry.key))
+            entry.key: entry.value
+      };
+    }
+    widget.backend
+        .triggerControlEvent(widget.control.id, eventName, json.encode(payload));
+  }
+
   void _updatePeriodicTimer() {
-    _periodicTimer?.cancel(); // Cancel any existing timer
-    if (widget.control.attrBool("enablePeriodicEvents", false) ?? false) {
-      debugPrint("Starting Dart periodic timer.");
-      _periodicTimer =
-          Timer.periodic(const Duration(seconds: 1), (Timer timer) {
-        _periodicCounter++;
-        // debugPrint("Dart periodic event: Counter = $_periodicCounter");
-        widget.backend.triggerControlEvent(
-          widget.control.id,
-          "dart_periodic_event", // Event name for Python handler
-          json.encode({"counter": _periodicCounter}),
-        );
-      });
-    } else {
-      debugPrint("Dart periodic timer is disabled or not explicitly enabled.");
+    final bool wanted =
+        (widget.control.attrBool("enablePeriodicEvents", false) ?? false) &&
+            _isSubscribed("dart_periodic_event");
+    if (!wanted) {
+      if (_periodicTimer != null) {
+        debugPrint("Stopping Dart periodic timer.");
+      }
+      _periodicTimer?.cancel();
+      _periodicTimer = null;
+      return;
+    }
+    if (_periodicTimer != null) {
+      return; // Already running
     }
+    debugPrint("Starting Dart periodic timer.");
+    _periodicTimer = Timer.periodic(const Duration(seconds: 1), (Timer timer) {
+      _periodicCounter++;
+      _emitEvent(
+        "dart_periodic_event", // Event name for Python handler
+        () => {"counter": _periodicCounter},
+      );
+    });
   }
 
-  // This method could be called if we were to implement live updates of the `enablePeriodicEvents` attribute
-  // For now, it's called from initState.
-  // @override
-  // void didUpdateWidget(covariant FletPackageGuideControl oldWidget) {
-  //   super.didUpdateWidget(oldWidget);
-  //   if (widget.control.attrBool("enablePeriodicEvents") !=
-  //       oldWidget.control.attrBool("enablePeriodicEvents")) {
-  //     _updatePeriodicTimer();
-  //   }
-  // }
+  @override
+  void didUpdateWidget(covariant FletPackageGuideControl oldWidget) {
+    super.didUpdateWidget(oldWidget);
+    // Handlers attached or removed in Python update the manifest, and
+    // enable_periodic_events may change after mount.
+    _readSubscriptions();
+    _updatePeriodicTimer();
+  }
 
   Future<String?> _onMethodCall(
       String methodName, Map<String, String> args) async {
+    final String? callId = args["_call_id"];
+    if (callId == null) {
+      return _dispatchMethodCall(methodName, args, null);
+    }
+    // Latency tracking: wrap the result with our receive/start/finish times.
+    final timing = _CallTiming(callId);
+    final String? result = await _dispatchMethodCall(methodName, args, timing);
+    return json.encode({"result": result, "timing": timing.toJson()});
+  }
+
+  Future<String?> _dispatchMethodCall(
+      String methodName, Map<String, String> args, _CallTiming? timing) async {
     switch (methodName) {
       case "play":
         return "you call play" + args["some"]!;
@@ -103,7 +271,7 @@ class _FletPackageGuideControlState extends State<FletPackageGuideControl> {
           return "Error: callback_id is missing";
         }
         // Call the async task method
-        start_async_task(message, callbackId);
+        start_async_task(message, callbackId, timing);
         return null; // Indicate that the method was handled
       case "long_running_task":
         final String data = args["data"] ?? "No data";
@@ -117,24 +285,91 @@ class _FletPackageGuideControlState extends State<FletPackageGuideControl> {
           debugPrint(
               "Error: task_id is missing or total_steps is invalid in start_task_with_progress");
           // Optionally send an error event back
-          widget.backend.triggerControlEvent(
-              widget.control.id,
+          _emitEvent(
               "task_update",
-              json.encode({
-                "task_id": taskId,
-                "status": "error",
-                "message": "Invalid parameters for task creation."
-              }));
+              () => {
+                    "task_id": taskId,
+                    "status": "error",
+                    "message": "Invalid parameters for task creation.",
+                    if (timing != null) "timing": timing.toJson(),
+                  },
+              status: "error");
           return null;
         }
-        start_task_with_progress(taskId, totalSteps);
+        start_task_with_progress(taskId, totalSteps, timing,
+            progress: args["progress"] != "false");
         return null; // Indicate method was handled, no direct string result
+      case "start_task_group":
+        // One call starts every task of a Python TaskGroup. Task ids are
+        // "<group_id>:<index>" so Python can route events by index.
+        final String groupId = args["group_id"] ?? "";
+        List<dynamic> totals = [];
+        try {
+          totals = json.decode(args["total_steps"] ?? "[]");
+        } catch (e) {
+          debugPrint("Error: invalid total_steps in start_task_group");
+        }
+        for (int i = 0; i < totals.length; i++) {
+          final int totalSteps = totals[i] is int ? totals[i] : 0;
+          if (groupId.isEmpty || totalSteps <= 0) {
+            _emitEvent(
+                "task_update",
+                () => {
+                      "task_id": "$groupId:$i",
+                      "status": "error",
+                      "message": "Invalid parameters for task creation.",
+                    },
+                status: "error");
+            continue;
+          }
+          start_task_with_progress("$groupId:$i", totalSteps, timing);
+        }
+        return null;
+      case "invoke_batch":
+        // Calls buffered by Python while the client was disconnected, sent
+        // as one message on reconnect. Returns the results in order.
+        List<dynamic> calls = [];
+        try {
+          calls = json.decode(args["calls"] ?? "[]");
+        } catch (e) {
+          debugPrint("Error: invalid calls in invoke_batch");
+        }
+        final results = await Future.wait(calls.map((call) => _onMethodCall(
+            call["method"] as String,
+            Map<String, String>.from(call["args"] as Map))));
+        return json.encode(results);
+      case "sync_tasks":
+        // {task_id: [total_steps, last_step]} as last seen by Python.
+        Map<String, dynamic> tasks = {};
+        try {
+          tasks = json.decode(args["tasks"] ?? "{}");
+        } catch (e) {
+          debugPrint("Error: invalid tasks in sync_tasks");
+        }
+        tasks.forEach((taskId, state) {
+          final int totalSteps = state[0] as int;
+          final int lastStep = state[1] as int;
+          final int? step = _taskSteps[taskId];
+          if (step != null) {
+            // Still running: report the step Python may have missed.
+            _emitProgress(taskId, step, totalSteps, null);
+          } else if (_finishedTasks.contains(taskId)) {
+            _emitCompletion(taskId, totalSteps, null);
+          } else {
+            // Unknown to this client, e.g. after a restart: resume after the
+            // last step Python saw.
+            start_task_with_progress(taskId, totalSteps, null,
+                startStep: lastStep + 1);
+          }
+        });
+        return null;
       default:
         return null;
     }
   }
 
-  void start_async_task(String message, String callbackId) {
+  void start_async_task(
+      String message, String callbackId, _CallTiming? timing) {
     debugPrint(
         "Dart start_async_task called with message: '$message', callbackId: '$callbackId'");
     // Simulate an async operation
@@ -142,10 +377,13 @@ class _FletPackageGuideControlState extends State<FletPackageGuideControl> {
       String result = "Async task for '$message' completed";
       debugPrint("Dart async task completed. Result: '$result'");
       // Send an event back to Python
-      widget.backend.triggerControlEvent(
-        widget.control.id,
+      _emitEvent(
         "async_callback", // Event name must match Python's event handler
-        json.encode({"callback_id": callbackId, "data": result}),
+        () => {
+          "callback_id": callbackId,
+          "data": result,
+          if (timing != null) "timing": timing.toJson(),
+        },
       );
     });
   }
@@ -160,37 +398,60 @@ class _FletPackageGuideControlState extends State<FletPackageGuideControl> {
     return result;
   }
 
-  Future<void> start_task_with_progress(String taskId, int totalSteps) async {
+  Future<void> start_task_with_progress(
+      String taskId, int totalSteps, _CallTiming? timing,
+      {bool progress = true, int startStep = 1}) async {
     debugPrint(
         "Dart start_task_with_progress called for task ID: $taskId with $totalSteps steps.");
 
-    for (int i = 1; i <= totalSteps; i++) {
+    _taskSteps[taskId] = startStep - 1;
+    for (int i = startStep; i <= totalSteps; i++) {
       await Future.delayed(
           const Duration(seconds: 1)); // Simulate one second of work per step
-      // Send progress update
+      _taskSteps[taskId] = i;
+      // Send progress update, unless this task was started without a
+      // progress handler.
       // debugPrint("Sending progress for task $taskId, step $i/$totalSteps");
-      widget.backend.triggerControlEvent(
-          widget.control.id,
-          "task_update", // Event name for Python handler
-          json.encode({
-            "task_id": taskId,
-            "status": "progress",
-            "current_step": i,
-            "total_steps": totalSteps
-          }));
+      if (progress) {
+        _emitProgress(taskId, i, totalSteps, timing);
+      }
     }
 
+    _taskSteps.remove(taskId);
+    _finishedTasks.add(taskId);
+    if (_finishedTasks.length > _maxFinishedTasks) {
+      _finishedTasks.remove(_finishedTasks.first);
+    }
     // Send completion event
     // debugPrint("Sending completion for task $taskId");
-    widget.backend.triggerControlEvent(
-        widget.control.id,
+    _emitCompletion(taskId, totalSteps, timing);
+  }
+
+  void _emitProgress(
+      String taskId, int step, int totalSteps, _CallTiming? timing) {
+    _emitEvent(
         "task_update", // Event name for Python handler
-        json.encode({
-          "task_id": taskId,
-          "status": "complete",
-          "message":
-              "Task $taskId finished successfully after $totalSteps steps."
-        }));
+        () => {
+              "task_id": taskId,
+              "status": "progress",
+              "current_step": step,
+              "total_steps": totalSteps,
+              if (timing != null) "timing": timing.toJson(),
+            },
+        status: "progress");
+  }
+
+  void _emitCompletion(String taskId, int totalSteps, _CallTiming? timing) {
+    _emitEvent(
+        "task_update", // Event name for Python handler
+        () => {
+              "task_id": taskId,
+              "status": "complete",
+              "message":
+                  "Task $taskId finished successfully after $totalSteps steps.",
+              if (timing != null) "timing": timing.toJson(),
+            },
+        status: "complete");
   }
 
   void handleSomething(dynamic value) {
@@ -198,8 +459,10 @@ class _FletPackageGuideControlState extends State<FletPackageGuideControl> {
     debugPrint("Handler triggered: $newValue");
     var props = {"value": newValue};
     widget.backend.updateControlState(widget.control.id, props);
-    widget.backend
-        .triggerControlEvent(widget.control.id, "on_something", newValue);
+    if (_isSubscribed("on_something")) {
+      widget.backend
+          .triggerControlEvent(widget.control.id, "on_something", newValue);
+    }
   }
 
   @override
@@ -208,8 +471,8 @@ class _FletPackageGuideControlState extends State<FletPackageGuideControl> {
     List<Color> colors = [Colors.red, Colors.blue, Colors.green];
     if (colorListJs != null) {
       try {
-        final List<dynamic> colorStrings = json.decode(colorListJs);
-        colors = parseColors(Theme.of(context), colorStrings);
+        colors = _PaletteCache.resolve(Theme.of(context),
+            widget.control.attrString("palette", null), colorListJs);
       } catch (e) {}
     }
 
@@ -221,9 +484,17 @@ class _FletPackageGuideControlState extends State<FletPackageGuideControl> {
 
     Widget? childWidget;
     if (contentCtrls.isNotEmpty) {
-      childWidget = createControl(
-          widget.control, contentCtrls.first.id, disabled,
-          parentAdaptive: adaptive);
+      final contentKey = (contentCtrls.first.id, disabled, adaptive);
+      if (_contentWidget == null || _contentKey != contentKey) {
+        _contentWidget = createControl(
+            widget.control, contentCtrls.first.id, disabled,
+            parentAdaptive: adaptive);
+        _contentKey = contentKey;
+      }
+      childWidget = _contentWidget;
+    } else {
+      _contentWidget = null;
+      _contentKey = null;
     }
 
     Widget debugText = Text(
@@ -0,0 +1,75 @@
+import flet as ft
+
+from flet_package_guide import FletPackageGuide
+
+
+class FakePage:
+    def __init__(self):
+        self._index = {"page": self}
+
+
+def mount(control):
+    page = FakePage()
+    added = []
+    control._build_add_commands(index=page._index, added_controls=added)
+    for i, c in enumerate(added):
+        c._Control__uid = f"_{i}"
+        page._index[c.uid] = c
+    return page
+
+
+def diff(control, page):
+    commands = []
+    control.build_update_commands(page._index, commands, [], [])
+    return [(c.name, c.values, c.attrs) for c in commands]
+
+
+def test_same_type_content_is_updated_in_place():
+    ctl = FletPackageGuide(content=ft.Icon(ft.Icons.ADD, color="red"))
+    page = mount(ctl)
+    old = ctl.content
+    uid = old.uid
+
+    ref = ft.Ref[ft.Icon]()
+    ctl.content = ft.Icon(ft.Icons.REMOVE, color="red", ref=ref)
+    assert diff(ctl, page) == [("set", [uid], {"name": "remove"})]
+
+    assert ref.current is ctl.content
+    assert ctl.content.uid == uid and ctl.content.page is page
+    assert page._index[uid] is ctl.content
+    assert old.uid is None and old.page is None
+
+    ref.current.color = "blue"
+    assert diff(ctl, page) == [("set", [uid], {"color": "blue"})]
+
+
+def test_removed_attribute_is_cleared():
+    ctl = FletPackageGuide(content=ft.Icon(ft.Icons.ADD, color="red"))
+    page = mount(ctl)
+    uid = ctl.content.uid
+    ctl.content = ft.Icon(ft.Icons.ADD)
+    assert diff(ctl, page) == [("set", [uid], {"color": ""})]
+
+
+def test_other_type_content_is_replaced():
+    ctl = FletPackageGuide(content=ft.Icon(ft.Icons.ADD))
+    page = mount(ctl)
+    uid = ctl.content.uid
+    ctl.content = ft.Text("x")
+    commands = diff(ctl, page)
+    assert commands[0] == ("remove", [uid], {})
+    assert commands[1][0] == "add"
+
+
+def test_content_with_mount_hooks_is_replaced():
+    class MountedIcon(ft.Icon):
+        def did_mount(self):
+            pass
+
+    ctl = FletPackageGuide(content=MountedIcon(ft.Icons.ADD))
+    page = mount(ctl)
+    old = ctl.content
+    ctl.content = MountedIcon(ft.Icons.REMOVE)
+    assert ctl.content.uid is None
+    assert old.uid is not None
+    assert diff(ctl, page)[0] == ("remove", [old.uid], {})
@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pytest
+
+from flet_package_guide import FletPackageGuide
+from flet_package_guide.testing import SimulatedClient
+
+
+class FailingClient(SimulatedClient):
+    def _dart_play(self, control_id, args, timing):
+        # Page._invoke_method raises a plain Exception for Dart errors.
+        raise Exception("play failed in Dart")
+
+
+@pytest.fixture
+def client():
+    c = SimulatedClient(time_scale=0.01)
+    yield c
+    c.close()
+
+
+def test_disconnect_buffers_and_reconnect_flushes(client):
+    ctl = client.attach(FletPackageGuide())
+    buffer = ctl.enable_outbound_buffer(ttl=5.0)
+    client.disconnect()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(ctl.play("x")))
+        for _ in range(3)
+    ]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 2
+    while len(buffer) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not buffer.connected
+    assert len(buffer) == 1  # idempotent calls are collapsed
+
+    client.reconnect()
+    ctl.client_reconnected()
+    for t in threads:
+        t.join(2)
+    assert results == ["you call playx"] * 3
+    assert buffer.connected
+    assert len(buffer) == 0
+
+
+def test_dart_error_is_raised_and_does_not_disconnect():
+    c = FailingClient(time_scale=0.01)
+    try:
+        ctl = c.attach(FletPackageGuide())
+        buffer = ctl.enable_outbound_buffer(ttl=5.0)
+        with pytest.raises(Exception, match="play failed in Dart"):
+            ctl.play("x")
+        assert buffer.connected
+        assert ctl.stop("x") == "you call stopx"
+    finally:
+        c.close()
+
+
+def test_unmounted_control_fails_instead_of_buffering():
+    ctl = FletPackageGuide()
+    buffer = ctl.enable_outbound_buffer()
+    with pytest.raises(AssertionError):
+        ctl.async_operation_with_callback("m", lambda data: None)
+    assert buffer.connected
+    assert len(buffer) == 0
+
+
+def test_expired_call_times_out_and_drops_callback(client):
+    ctl = client.attach(FletPackageGuide())
+    ctl.enable_outbound_buffer(ttl=0.05)
+    ctl.client_disconnected()
+    ctl.async_operation_with_callback("m", lambda data: None)
+    with pytest.raises(TimeoutError):
+        ctl.play("x")
+    client.reconnect()
+    ctl.client_reconnected()
+    assert ctl._async_callbacks == {}
+
+
+def test_task_started_while_disconnected_runs_once(client):
+    ctl = client.attach(FletPackageGuide())
+    ctl.enable_outbound_buffer(ttl=5.0)
+    ctl.client_disconnected()
+    steps, done = [], threading.Event()
+    ctl.start_task_with_progress_updates(
+        3, lambda e: steps.append(e["current_step"]), lambda e: done.set()
+    )
+    group = ctl.start_task_group([2, 2])
+    client.reconnect()
+    ctl.client_reconnected()
+    assert done.wait(2)
+    deadline = time.monotonic() + 2
+    while not group.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    assert steps == [1, 2, 3]
+    assert group.completed_count == 2
+
+
+def test_running_task_is_resynced_not_restarted(client):
+    ctl = client.attach(FletPackageGuide())
+    ctl.enable_outbound_buffer(ttl=5.0)
+    steps, done = [], threading.Event()
+    ctl.start_task_with_progress_updates(
+        20, lambda e: steps.append(e["current_step"]), lambda e: done.set()
+    )
+    time.sleep(0.035)
+    client.disconnect()
+    ctl.client_disconnected()
+    time.sleep(0.05)
+    client.reconnect()
+    ctl.client_reconnected()
+    assert done.wait(2)
+    assert steps == sorted(steps)
+    assert steps[-1] == 20
+    assert len(steps) == len(set(steps))
+
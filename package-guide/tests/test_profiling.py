@@ -0,0 +1,97 @@
+import asyncio
+import pstats
+import threading
+import time
+
+import pytest
+
+from flet_package_guide.profiling import CPROFILE, SAMPLE, HandlerProfiler
+
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < deadline:
+        n += 1
+    return n
+
+
+@pytest.fixture
+def profiler():
+    p = HandlerProfiler(SAMPLE, interval=0.001)
+    yield p
+    p.stop()
+
+
+def test_run_samples_the_handler(profiler):
+    assert profiler.run(("on_something", None), busy, 0.05) > 0
+    assert profiler.keys() == [("on_something", None)]
+    assert profiler.calls(("on_something", None)) == 1
+    stacks = profiler.collapsed(("on_something", None))
+    assert stacks
+    assert all(stack.startswith("busy ") for stack in stacks)
+
+
+def test_run_async_profiles_only_running_steps(profiler):
+    async def handler():
+        busy(0.03)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    assert asyncio.run(profiler.run_async(("on_something", None), handler)) == "done"
+    assert profiler.calls(("on_something", None)) == 1
+    stacks = profiler.collapsed(("on_something", None))
+    assert stacks
+    assert not any("sleep" in stack for stack in stacks)
+
+
+def test_dump_writes_one_file_per_key(profiler, tmp_path):
+    profiler.run(("task_update", "a/b"), busy, 0.03)
+    profiler.run(("on_something", None), busy, 0.03)
+    paths = profiler.dump(str(tmp_path))
+    names = sorted(p.rsplit("/", 1)[-1] for p in paths)
+    assert names == ["on_something.folded", "task_update.a_b.folded"]
+    line = (tmp_path / "on_something.folded").read_text().splitlines()[0]
+    assert int(line.rsplit(" ", 1)[1]) > 0
+
+
+def test_cprofile_dump(tmp_path):
+    profiler = HandlerProfiler(CPROFILE)
+    profiler.run(("on_something", None), busy, 0.01)
+    (path,) = profiler.dump(str(tmp_path))
+    assert path.endswith("on_something.pstats")
+    stats = pstats.Stats(path)
+    assert any(func[2] == "busy" for func in stats.stats)
+
+
+def test_cprofile_skips_and_does_not_count_concurrent_calls():
+    profiler = HandlerProfiler(CPROFILE)
+    entered, release = threading.Event(), threading.Event()
+
+    def blocking():
+        entered.set()
+        release.wait(2)
+
+    t = threading.Thread(target=profiler.run, args=(("slow", None), blocking))
+    t.start()
+    assert entered.wait(2)
+    assert profiler.run(("fast", None), lambda: 42) == 42
+    release.set()
+    t.join()
+    assert profiler.calls(("slow", None)) == 1
+    assert profiler.calls(("fast", None)) == 0
+    assert profiler.keys() == [("slow", None)]
+
+
+def test_task_keys_are_capped_least_recently_used_first():
+    profiler = HandlerProfiler(CPROFILE, max_task_keys=2)
+    for task_id in ("a", "b", "a", "c"):
+        profiler.run(("task_update", task_id), lambda: None)
+    profiler.run(("on_something", None), lambda: None)
+    assert profiler.keys() == [
+        ("on_something", None),
+        ("task_update", "a"),
+        ("task_update", "c"),
+    ]
+    assert profiler.calls(("task_update", "a")) == 2
+    assert profiler.stats(("task_update", "b")) is None
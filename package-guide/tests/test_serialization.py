@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from flet_package_guide import FletPackageGuide
+
+
+class RecordingControl(FletPackageGuide):
+    def __init__(self, **kwargs):
+        self.writes = []
+        super().__init__(**kwargs)
+
+    def _set_attr(self, name, value, dirty=True):
+        self.writes.append((name, value))
+        super()._set_attr(name, value, dirty)
+
+
+@pytest.fixture
+def gated_executor():
+    # A single worker that is busy until the gate opens, so writes stay pending.
+    executor = ThreadPoolExecutor(1)
+    gate = threading.Event()
+    executor.submit(gate.wait, 2)
+    yield executor, gate
+    gate.set()
+    executor.shutdown()
+
+
+def test_concurrent_writes_apply_only_the_last(gated_executor):
+    executor, gate = gated_executor
+    ctl = RecordingControl()
+    ctl.writes.clear()
+
+    async def main():
+        writes = [
+            asyncio.ensure_future(ctl.set_complex_data_async({"v": i}, executor))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        assert not any(w.done() for w in writes)
+        gate.set()
+        await asyncio.gather(*writes)
+
+    asyncio.run(main())
+    assert ctl.writes == [("complex_data", '{"v":2}')]
+    assert ctl._attr_writes.pending("complex_data") is False
+
+
+def test_sync_assignment_wins_over_pending_async_write(gated_executor):
+    executor, gate = gated_executor
+    ctl = FletPackageGuide()
+
+    async def main():
+        write = asyncio.ensure_future(ctl.set_colors_async(["red"], executor))
+        await asyncio.sleep(0.01)
+        ctl.colors = ["blue"]
+        gate.set()
+        await write
+
+    asyncio.run(main())
+    assert ctl.colors == '["blue"]'
+
+
+def test_bad_color_raises_to_every_waiter(gated_executor):
+    executor, gate = gated_executor
+    ctl = FletPackageGuide(colors=["red"])
+
+    async def main():
+        writes = [
+            asyncio.ensure_future(ctl.set_colors_async(colors, executor))
+            for colors in (["green"], ["blue"], ["not-a-color"])
+        ]
+        await asyncio.sleep(0.01)
+        gate.set()
+        return await asyncio.gather(*writes, return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert ctl.colors == '["red"]'
+    assert ctl._attr_writes.pending("colors") is False
@@ -0,0 +1,86 @@
+import json
+import threading
+import time
+
+import pytest
+
+from flet_package_guide import FletPackageGuide
+from flet_package_guide.testing import SimulatedClient
+
+
+@pytest.fixture
+def client():
+    c = SimulatedClient(time_scale=0.01)
+    yield c
+    c.close()
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_statuses_and_fields_follow_the_manifest(client):
+    ctl = FletPackageGuide()
+    ctl.set_event_subscription("task_update", fields=[], statuses=[])
+    client.attach(ctl)
+    events, done = [], threading.Event()
+    ctl.start_task_with_progress_updates(
+        3, lambda e: events.append(e), lambda e: (events.append(e), done.set())
+    )
+    assert done.wait(2)
+    # Progress is filtered out; complete is always sent, trimmed to routing fields.
+    assert [e["status"] for e in events] == ["complete"]
+    assert set(events[0]) == {"task_id", "status"}
+
+
+def test_periodic_timer_stops_when_unsubscribed(client):
+    ticks = []
+    ctl = client.attach(FletPackageGuide(on_something=None))
+    ctl.on_dart_periodic_event = lambda e: ticks.append(json.loads(e.data)["counter"])
+    ctl.update()
+    assert wait_for(lambda: len(ticks) >= 2)
+
+    ctl.on_dart_periodic_event = None
+    ctl.update()
+    time.sleep(0.03)
+    count = len(ticks)
+    time.sleep(0.05)
+    assert len(ticks) == count
+    assert client._periodic_timers == {}
+
+
+def test_events_carry_timing_with_latency_tracking(client):
+    ctl = client.attach(FletPackageGuide())
+    ctl.enable_latency_tracking()
+    done = threading.Event()
+    ctl.async_operation_with_callback("m", lambda data: done.set())
+    group = ctl.start_task_group([1, 2])
+    assert done.wait(2)
+    assert wait_for(lambda: group.finished)
+    time.sleep(0.02)
+
+    histograms = ctl.latency_histograms()
+    assert histograms["start_async_task"]["total"].count == 1
+    assert histograms["start_task_group"]["total"].count == 2
+    assert "start_task_with_progress" not in histograms
+    assert len(ctl.latency_tracker._pending) == 0
+
+
+def test_trimmed_task_updates_keep_progress_fields(client):
+    ctl = FletPackageGuide()
+    ctl.set_event_subscription("task_update", fields=["message"])
+    client.attach(ctl)
+    steps, done = [], threading.Event()
+    ctl.start_task_group(
+        [5, 5],
+        on_update=lambda g: steps.append(g._steps_done),
+        on_complete=lambda g: done.set(),
+        min_interval=0,
+    )
+    assert done.wait(2)
+    # Progress events, not only completions, moved the step count.
+    assert {1, 2, 3} <= set(steps)
+    assert steps[-1] == 10
@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+
+from flet_package_guide import task_group
+from flet_package_guide.task_group import TaskGroup
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = FakeClock()
+    monkeypatch.setattr(task_group.time, "monotonic", c)
+    return c
+
+
+def started(totals, **kwargs):
+    group = TaskGroup(totals, **kwargs)
+    group._mark_started(task_group.time.monotonic())
+    return group
+
+
+def test_progress_eta_and_counts(clock):
+    group = started([4, 6])
+    assert group.progress == 0.0
+    assert group.eta is None
+
+    clock.now += 2
+    group._on_task_update(0, "progress", {"current_step": 2})
+    group._on_task_update(1, "progress", {"current_step": 3})
+    assert group.progress == pytest.approx(0.5)
+    # 5 steps in 2 s, 5 to go.
+    assert group.eta == pytest.approx(2.0)
+
+    group._on_task_update(0, "complete", {})
+    group._on_task_update(1, "error", {})
+    assert (group.completed_count, group.error_count, group.running_count) == (1, 1, 0)
+    assert group.finished
+    # A late progress event does not reopen a finished task.
+    group._on_task_update(0, "progress", {"current_step": 1})
+    assert group.step[0] == 4
+
+
+def test_progress_without_current_step_is_ignored(clock):
+    group = started([5])
+    group._on_task_update(0, "progress", {"current_step": 3})
+    group._on_task_update(0, "progress", {"message": "working"})
+    assert group.step[0] == 3
+    assert group.progress == pytest.approx(0.6)
+
+
+def test_running_and_stalled_indices(clock):
+    group = started([3, 3, 3])
+    clock.now += 10
+    group._on_task_update(0, "progress", {"current_step": 1})
+    group._on_task_update(2, "complete", {})
+    assert group.running_indices() == [0, 1]
+    assert group.stalled_indices(5) == [1]
+    assert group.stalled_count(5) == 1
+    assert group.stalled_indices(20) == []
+
+
+def test_suppressed_update_is_flushed_after_the_interval():
+    updates = []
+    group = started([10], on_update=lambda g: updates.append(g.step[0]), min_interval=0.05)
+    group._on_task_update(0, "progress", {"current_step": 1})
+    group._on_task_update(0, "progress", {"current_step": 2})
+    group._on_task_update(0, "progress", {"current_step": 3})
+    assert updates == [1]
+    deadline = time.monotonic() + 2
+    while len(updates) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert updates == [1, 3]
+
+
+def test_completion_cancels_pending_flush():
+    updates, done = [], threading.Event()
+    group = started(
+        [2],
+        on_update=lambda g: updates.append(g.step[0]),
+        on_complete=lambda g: done.set(),
+        min_interval=0.05,
+    )
+    group._on_task_update(0, "progress", {"current_step": 1})
+    group._on_task_update(0, "complete", {})
+    assert done.is_set()
+    time.sleep(0.1)
+    assert updates == [1, 2]
+
+
+def per_event_seconds(n, events=2000):
+    group = started([events] * n, min_interval=3600)
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for step in range(events // 5):
+            group._on_task_update(step % n, "progress", {"current_step": step})
+        best = min(best, (time.perf_counter() - start) / (events // 5))
+    return best
+
+
+def test_per_event_cost_is_flat_from_10_to_100k_tasks():
+    small = per_event_seconds(10)
+    large = per_event_seconds(100_000)
+    assert large < small * 3
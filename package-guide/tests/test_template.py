@@ -0,0 +1,71 @@
+import flet as ft
+import pytest
+
+from flet_package_guide import FletPackageGuide
+
+
+def on_something(e):
+    pass
+
+
+@pytest.fixture
+def template():
+    return FletPackageGuide.template(
+        colors=[ft.Colors.RED, ft.Colors.BLUE],
+        complex_data={"a": [1, 2]},
+        data={"rows": []},
+        tooltip=ft.Tooltip(message="hi"),
+        on_something=on_something,
+    )
+
+
+def mutable_values(control):
+    return [
+        v
+        for v in control.__dict__.values()
+        if v is not None and not isinstance(v, (str, int, float, bool, tuple))
+    ]
+
+
+def test_clones_share_no_mutable_state(template):
+    a, b = template(), template()
+    assert set(a.__dict__) == set(template._prototype.__dict__)
+    shared = {id(v) for v in mutable_values(a)} & {
+        id(v) for v in mutable_values(b) + mutable_values(template._prototype)
+    }
+    assert not shared
+
+    a.data["rows"].append(1)
+    a.tooltip.message = "changed"
+    a.set_event_subscription("task_update", fields=["message"])
+    assert b.data == {"rows": []}
+    assert b.tooltip.message == "hi"
+    assert b._event_subscriptions == {}
+
+
+def test_clone_keeps_template_properties(template):
+    ctl = template()
+    assert ctl.colors == '["red","blue"]'
+    assert ctl.complex_data == {"a": [1, 2]}
+    assert ctl.on_something is on_something
+    assert ctl.uid is None and ctl.page is None and ctl.content is None
+
+
+def test_overrides_apply_to_one_clone_only(template):
+    a = template(colors=[ft.Colors.GREEN], content=ft.Text("a"))
+    b = template()
+    assert a.colors == '["green"]'
+    assert b.colors == '["red","blue"]'
+    assert a.content.value == "a" and b.content is None
+    with pytest.raises(TypeError):
+        template(not_a_property=1)
+
+
+def test_own_handlers_are_rebound_to_the_clone(template):
+    ctl = template()
+    for name in ("async_callback", "task_update", "on_something"):
+        # Dispatchers are bound to the clone, not the prototype.
+        assert ctl._Control__event_handlers[name].func.__self__ is ctl
+    assert ctl._raw_event_handlers["async_callback"].__self__ is ctl
+    assert ctl._raw_event_handlers["task_update"].__self__ is ctl
+    assert ctl._raw_event_handlers["on_something"] is on_something
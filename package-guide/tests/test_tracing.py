@@ -0,0 +1,103 @@
+import asyncio
+import threading
+
+import pytest
+
+from flet_package_guide import FletPackageGuide, TraceReplayer, read_trace
+from flet_package_guide.testing import SimulatedClient
+
+
+@pytest.fixture
+def client():
+    c = SimulatedClient(time_scale=0.01)
+    yield c
+    c.close()
+
+
+def record_progress_task(client, path, total_steps=3):
+    ctl = client.attach(FletPackageGuide())
+    ctl.start_trace(path)
+    done = threading.Event()
+    ctl.start_task_with_progress_updates(total_steps, lambda e: None, lambda e: done.set())
+    assert done.wait(2)
+    ctl.stop_trace()
+
+
+@pytest.mark.parametrize("name", ["trace.jsonl", "trace.jsonl.gz"])
+def test_recorded_trace_round_trips(client, tmp_path, name):
+    path = str(tmp_path / name)
+    record_progress_task(client, path)
+    header, records = read_trace(path)
+    assert header["payloads"] is True
+    assert [(r.direction, r.name) for r in records] == [
+        ("out", "start_task_with_progress"),
+        ("in", "task_update"),
+        ("in", "task_update"),
+        ("in", "task_update"),
+        ("in", "task_update"),
+    ]
+    assert records[0].payload["total_steps"] == "3"
+    assert all(r.size > 0 for r in records)
+    assert [r.t for r in records] == sorted(r.t for r in records)
+
+
+def test_gzip_trace_is_compressed(client, tmp_path):
+    path = tmp_path / "trace.jsonl.gz"
+    record_progress_task(client, str(path))
+    assert path.read_bytes()[:2] == b"\x1f\x8b"
+
+
+def test_replay_routes_task_updates_through_on_call(client, tmp_path):
+    path = str(tmp_path / "trace.jsonl.gz")
+    record_progress_task(client, path)
+
+    ctl = FletPackageGuide()
+    progress, completed = [], []
+
+    def on_call(record):
+        # Register handlers under the recorded task id, as the original
+        # start_task_with_progress_updates() call did.
+        if record.name == "start_task_with_progress":
+            task_id = record.payload["task_id"]
+            ctl._progress_handlers[task_id] = progress.append
+            ctl._completion_handlers[task_id] = completed.append
+
+    report = TraceReplayer.from_file(path).replay(ctl, speed=None, on_call=on_call)
+    assert (report.calls, report.events, report.unhandled) == (1, 4, 0)
+    assert [e["current_step"] for e in progress] == [1, 2, 3]
+    assert [e["status"] for e in completed] == ["complete"]
+    assert report.handlers["task_update"].errors == 0
+    assert len(report.handlers["task_update"].latencies) == 4
+
+
+def test_replay_without_payloads_is_rejected(client, tmp_path):
+    path = str(tmp_path / "trace.jsonl")
+    ctl = client.attach(FletPackageGuide())
+    ctl.start_trace(path, include_payloads=False)
+    ctl.play("x")
+    ctl.stop_trace()
+    with pytest.raises(ValueError):
+        TraceReplayer.from_file(path)
+
+
+def test_async_calls_are_traced_timed_and_buffered(client, tmp_path):
+    ctl = client.attach(FletPackageGuide())
+    ctl.enable_latency_tracking()
+    ctl.enable_outbound_buffer(ttl=5.0)
+    ctl.start_trace(str(tmp_path / "trace.jsonl"))
+
+    async def main():
+        assert await ctl.invoke_method_async("play", {"some": "x"}, True) == "you call playx"
+        client.disconnect()
+        pending = asyncio.ensure_future(ctl.invoke_method_async("play", {"some": "y"}, True))
+        await asyncio.sleep(0.05)
+        assert not pending.done()
+        client.reconnect()
+        await asyncio.get_running_loop().run_in_executor(None, ctl.client_reconnected)
+        return await pending
+
+    assert asyncio.run(main()) == "you call playy"
+    ctl.stop_trace()
+    assert ctl.latency_histograms("play")["play"]["total"].count == 2
+    _, records = read_trace(str(tmp_path / "trace.jsonl"))
+    assert [r.name for r in records if r.direction == "out"] == ["play", "play"]